@@ -0,0 +1,117 @@
+"""Yerel teklif servisi (``python -m teklif.server``) için yük testi.
+
+Kullanım (depo kökünden)::
+
+    python -m teklif.server --port 8600 -j 4 &
+    python benchmarks/load_test.py --url http://127.0.0.1:8600 -c 8 -n 400 --products 50
+
+Her istemci thread'i tek bir keep-alive bağlantısı üzerinden art arda
+``POST /quote`` gönderir. Sonunda saniyedeki istek sayısı, gecikme
+yüzdelikleri (p50/p90/p95/p99) ve durum kodlarının dağılımı yazdırılır.
+"""
+import argparse
+import http.client
+import json
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def sample_payload(product_count, compact=False):
+    return {
+        'customer_company': 'Saloon Burger',
+        'contact_person': 'Mehmet Yılmaz',
+        'compact': compact,
+        'products': [
+            {
+                'name': f'Pul Biber {i}',
+                'unit_price': 100.0 + i % 500,
+                'vat_rate': 1.0 if i % 3 else 10.0,
+                'package_kg': 5.0 if i % 2 else 0.0,
+            }
+            for i in range(product_count)
+        ],
+    }
+
+
+def percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(percent / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def run_client(host, port, body, count, latencies, statuses, lock):
+    connection = http.client.HTTPConnection(host, port, timeout=300)
+    headers = {'Content-Type': 'application/json'}
+    for _ in range(count):
+        started = time.perf_counter()
+        try:
+            connection.request('POST', '/quote', body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            # Bağlantı koptuysa yeniden açılır; istek hata olarak sayılır
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=300)
+            status = 'hata'
+        elapsed = time.perf_counter() - started
+        with lock:
+            statuses[status] += 1
+            if status == 200:
+                latencies.append(elapsed)
+    connection.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8600')
+    parser.add_argument('-c', '--concurrency', type=int, default=4, help='Eşzamanlı istemci sayısı')
+    parser.add_argument('-n', '--requests', type=int, default=100, help='Toplam istek sayısı')
+    parser.add_argument('--products', type=int, default=20, help='Teklif başına ürün sayısı')
+    parser.add_argument('--compact', action='store_true', help='Kompakt PDF iste')
+    args = parser.parse_args(argv)
+
+    url = urlsplit(args.url)
+    body = json.dumps(sample_payload(args.products, args.compact)).encode('utf-8')
+    per_client = [args.requests // args.concurrency] * args.concurrency
+    for i in range(args.requests % args.concurrency):
+        per_client[i] += 1
+
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(
+            target=run_client,
+            args=(url.hostname, url.port or 80, body, count, latencies, statuses, lock),
+        )
+        for count in per_client if count
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total = sum(statuses.values())
+    print(f"{total} istek, {args.concurrency} istemci, teklif başına {args.products} ürün")
+    print(f"Süre: {elapsed:.2f} sn, {statuses[200] / elapsed:.1f} başarılı istek/sn")
+    if latencies:
+        print("Gecikme (ms): " + ", ".join(
+            f"p{p} {percentile(latencies, p) * 1000:.1f}" for p in PERCENTILES
+        ) + f", ortalama {statistics.mean(latencies) * 1000:.1f}, en fazla {latencies[-1] * 1000:.1f}")
+    print("Durum kodları: " + ", ".join(f"{status}: {n}" for status, n in sorted(statuses.items(), key=str)))
+    return 0 if statuses[200] == total else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
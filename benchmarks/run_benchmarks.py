@@ -0,0 +1,279 @@
+"""Teklif üretimi ve uygulama rerun'ları için benchmark paketi.
+
+Kullanım (depo kökünden)::
+
+    python benchmarks/run_benchmarks.py                 # ölç, baseline ile karşılaştır
+    python benchmarks/run_benchmarks.py --quick         # 10.000 ürünlük PDF'leri atla
+    python benchmarks/run_benchmarks.py --update-baseline
+
+Sonuçlar ``benchmarks/results.json``'a yazılır. Medyan süresi baseline'daki
+değerden ``--tolerance`` oranından fazla kötüleşen her ölçüm regresyon sayılır
+ve komut 1 ile çıkar; deploy öncesi CI'da çalıştırılmak üzere tasarlanmıştır.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+APP_FILE = os.path.join(REPO_DIR, 'fiyat-uygulamasi.py')
+RESULTS_FILE = os.path.join(BENCH_DIR, 'results.json')
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+
+PDF_SIZES = [10, 100, 1000, 10000]
+RERUN_SIZES = [100, 1000, 5000]
+# Rerun'lar birkaç on ms sürer; medyan gürültüden etkilenmesin diye daha çok tekrarlanır
+RERUN_REPEAT = 15
+
+# Bu kadar küçük farklar (mikrosaniyelik ölçümler) ölçüm gürültüsü sayılır
+MIN_REGRESSION_DELTA_S = 0.001
+
+
+def sample_products(count):
+    from teklif.products import make_product
+    return [
+        make_product(f"Pul Biber {i}", 100.0 + i % 500, 1.0 if i % 3 else 10.0, 5.0 if i % 2 else 0.0)
+        for i in range(count)
+    ]
+
+
+def make_logo(directory):
+    from PIL import Image, ImageDraw
+    logo = Image.new('RGB', (600, 500), 'white')
+    ImageDraw.Draw(logo).ellipse((50, 50, 550, 450), fill=(220, 53, 69))
+    path = os.path.join(directory, 'logo.png')
+    logo.save(path)
+    return path
+
+
+def measure(func, repeat, setup=None):
+    """``func``'ı ``repeat`` kez çalıştırıp süreleri (sn) döner; ``setup`` ölçülmez."""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def embedded_images(pdf_bytes):
+    """PDF'e gömülü görüntü sayısı (saydamlık maskeleri ayrı görüntü sayılmaz)."""
+    return pdf_bytes.count(b'/Subtype /Image') - pdf_bytes.count(b'/SMask ')
+
+
+def full_fonts(pdf_bytes):
+    """Alt küme (ABCDEF+Ad) yerine tamamen gömülmüş fontların adları."""
+    return [
+        name.decode('latin-1') for name in re.findall(rb'/FontName /(\S+)', pdf_bytes)
+        if not re.match(rb'[A-Z]{6}\+', name)
+    ]
+
+
+def bench_pdf(results, logo_path, sizes, failures):
+    from teklif.render import QuoteRenderer
+
+    variants = [
+        ('nologo', {'watermark': False}),
+        ('logo', {}),
+        ('compact', {'compact': True}),
+    ]
+    for variant, options in variants:
+        renderer = QuoteRenderer(logo_file=logo_path, **options)
+        with_logo = renderer.use_watermark
+        for size in sizes:
+            products = sample_products(size)
+            repeat = 3 if size >= 1000 else 10
+            name = f"pdf_{size}_{variant}"
+            pdf = renderer.render("Saloon Burger", "Mehmet Yılmaz", products)
+            timings = measure(lambda: renderer.render("Saloon Burger", "Mehmet Yılmaz", products), repeat)
+            pages = pdf.count(b'/Type /Page\n')
+            results[name] = summarize(timings, rows=size)
+            results[name].update(bytes=len(pdf), pages=pages, bytes_per_page=len(pdf) // max(pages, 1))
+
+            # Filigran sayfa sayısından bağımsız olarak tek kez gömülmeli
+            images = embedded_images(pdf)
+            if images != (1 if with_logo else 0):
+                failures.append(f"{name}: {images} gömülü görüntü")
+            for font in full_fonts(pdf):
+                failures.append(f"{name}: {font} alt küme olarak gömülmemiş")
+
+
+def bench_watermark(results, logo_path):
+    from teklif import watermark
+
+    results['watermark_build'] = summarize(
+        measure(lambda: watermark.build_watermark_image(logo_path), 10)
+    )
+    # Önbellekten (her sayfa/teklif için ödenen maliyet)
+    watermark.get_watermark(logo_path)
+    results['watermark_cached'] = summarize(
+        measure(lambda: watermark.get_watermark(logo_path), 1000)
+    )
+
+
+def bench_fonts(results):
+    from reportlab.pdfbase.ttfonts import TTFont
+    from teklif import fonts
+
+    # İlk kurulum: iki TTF dosyasının ayrıştırılması
+    def parse_fonts():
+        for name, filename in (fonts.NORMAL_FONT, fonts.BOLD_FONT):
+            TTFont(name, fonts.find_font_file(filename))
+
+    try:
+        results['setup_fonts_cold'] = summarize(measure(parse_fonts, 5))
+    except FileNotFoundError:
+        pass
+    # Sonraki çağrılar (her Streamlit rerun'ı)
+    fonts.setup_fonts()
+    results['setup_fonts_warm'] = summarize(measure(fonts.setup_fonts, 1000))
+
+
+def bench_reruns(results, workdir, sizes):
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("streamlit bulunamadı, rerun ölçümleri atlandı", file=sys.stderr)
+        return
+
+    # AppTest her run'da betiği baştan derler (magic dahil); sunucu ise süreç başına bir kez.
+    # Ölçüm betiğin uzunluğuna değil, rerun'da yapılan işe baksın diye derlenmiş kod paylaşılır.
+    # Bu Streamlit'in iç API'sidir; bulunamazsa düz AppTest ile ölçülür ve sonuçta işaretlenir.
+    try:
+        from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+        from streamlit.testing.v1 import local_script_runner
+        original_cache = local_script_runner.ScriptCache
+    except (ImportError, AttributeError):
+        print("Streamlit ScriptCache bulunamadı, rerun'lar her seferinde derlenerek ölçülüyor",
+              file=sys.stderr)
+        local_script_runner = None
+    else:
+        shared_cache = ScriptCache()
+        local_script_runner.ScriptCache = lambda: shared_cache
+    compiled_once = local_script_runner is not None
+
+    try:
+        for size in sizes:
+            products = sample_products(size)
+            app = AppTest.from_file(APP_FILE, default_timeout=120)
+            app.run()
+            app.session_state.products = products
+            app.run()
+
+            timings = measure(app.run, RERUN_REPEAT)
+            if app.exception:
+                raise RuntimeError(f"rerun_{size}: {app.exception[0].value}")
+            results[f'rerun_{size}'] = dict(summarize(timings, rows=size), compiled_once=compiled_once)
+    finally:
+        if compiled_once:
+            local_script_runner.ScriptCache = original_cache
+
+
+def summarize(timings, rows=None):
+    summary = {
+        'median_s': statistics.median(timings),
+        'min_s': min(timings),
+        'repeat': len(timings),
+    }
+    if rows:
+        summary['rows_per_s'] = rows / summary['median_s']
+    return summary
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, current in sorted(results.items()):
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"  {name:<22} {current['median_s'] * 1000:10.2f} ms   (baseline yok)")
+            continue
+        if current.get('compiled_once', False) != reference.get('compiled_once', False):
+            # Derleme dahil ve hariç ölçülen rerun süreleri karşılaştırılamaz
+            print(f"  {name:<22} {current['median_s'] * 1000:10.2f} ms   (ölçüm yöntemi farklı, karşılaştırılmadı)")
+            continue
+        ratio = current['median_s'] / reference['median_s']
+        flag = ''
+        delta = current['median_s'] - reference['median_s']
+        if ratio > 1 + tolerance and delta > MIN_REGRESSION_DELTA_S:
+            flag = '  <-- REGRESYON'
+            regressions.append(name)
+        print(f"  {name:<22} {current['median_s'] * 1000:10.2f} ms   x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='10.000 ürünlük PDF ölçümlerini atla')
+    parser.add_argument('--no-rerun', action='store_true', help='Streamlit rerun ölçümlerini atla')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='İzin verilen yavaşlama oranı (varsayılan 0.25 = %%25)')
+    parser.add_argument('--output', default=RESULTS_FILE)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Sonuçları yeni baseline olarak kaydet')
+    args = parser.parse_args(argv)
+
+    pdf_sizes = [s for s in PDF_SIZES if not (args.quick and s >= 10000)]
+    results = {}
+    failures = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Uygulama logoyu çalışma klasöründe arar; katalog ve arşiv de geçici klasörde açılır
+        os.environ['TEKLIF_CATALOG_DB'] = os.path.join(workdir, 'katalog.db')
+        os.environ['TEKLIF_ARCHIVE_DB'] = os.path.join(workdir, 'teklif_arsivi.db')
+        previous_cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            logo_path = make_logo(workdir)
+            bench_fonts(results)
+            bench_watermark(results, logo_path)
+            bench_pdf(results, logo_path, pdf_sizes, failures)
+            if not args.no_rerun:
+                bench_reruns(results, workdir, RERUN_SIZES)
+        finally:
+            os.chdir(previous_cwd)
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline güncellendi: {args.baseline}")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    print(f"Sonuçlar: {args.output}")
+    regressions = compare(results, baseline, args.tolerance)
+    for failure in failures:
+        print(f"HATA: {failure}")
+    if regressions:
+        print(f"{len(regressions)} regresyon: {', '.join(regressions)}")
+    if regressions or failures:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
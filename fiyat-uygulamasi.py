@@ -1,17 +1,25 @@
 import streamlit as st
-import pandas as pd
+import time
+import uuid
 from datetime import datetime
-import os
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from PIL import Image as PILImage
-import io
+from functools import partial
+
+# Yalnızca hafif modüller burada yüklenir. pandas (toplu fiyat, içe aktarma) ile
+# reportlab ve PIL (PDF) ilk kullanıldıkları yerde içeri aktarılır.
+from teklif.archive import QuoteArchive
+from teklif.catalog import Catalog, turkish_fold
+from teklif.diagnostics import (
+    configure_logging, debug_panel_enabled, first_render_seconds, mark_first_render, record,
+    recent, session_footprint, span, summary,
+)
+from teklif.gridcache import grid_cache_from_env
+from teklif.pdfcache import cache_from_env
+from teklif.pdfstore import store_from_env
+from teklif.products import DERIVED_COLUMNS, make_product, validate_product
+
+# Rerun süresi ölçümü (aşama süreleri TEKLIF_TIMING_LOG=1 ile JSON olarak loglanır)
+rerun_started = time.perf_counter()
+configure_logging()
 
 # Sayfa ayarları
 st.set_page_config(
@@ -42,29 +50,91 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Türkçe font desteği
-def setup_fonts():
-    try:
-        # Eğer fontları aynı klasöre koyduysan:
-        normal_font_path = os.path.join(os.path.dirname(__file__), "DejaVuSans.ttf")
-        bold_font_path = os.path.join(os.path.dirname(__file__), "DejaVuSans-Bold.ttf")
+@st.cache_resource
+def get_renderer(compact=False):
+    # reportlab, PIL ve Türkçe fontlar ilk PDF'te yüklenir; stiller tüm oturumlarca paylaşılır
+    with span('app.pdf_imports'):
+        from teklif.fonts import setup_fonts
+        from teklif.render import QuoteRenderer
+    
+    # Türkçe font desteği (süreç başına bir kez yüklenir)
+    with span('app.fonts'):
+        fonts = setup_fonts()
+    return QuoteRenderer(fonts.normal, fonts.bold, compact=compact)
 
-        # Eğer fonts klasörüne koyduysan, üsttekiler yerine şunu kullan:
-        # normal_font_path = os.path.join(os.path.dirname(__file__), "fonts", "DejaVuSans.ttf")
-        # bold_font_path   = os.path.join(os.path.dirname(__file__), "fonts", "DejaVuSans-Bold.ttf")
 
-        pdfmetrics.registerFont(TTFont("DejaVuSans", normal_font_path))
-        pdfmetrics.registerFont(TTFont("DejaVuSans-Bold", bold_font_path))
+@st.cache_resource
+def get_pdf_cache():
+    # Tüm oturumlarca paylaşılan, bayt bütçeli PDF önbelleği (TEKLIF_PDF_CACHE_MB)
+    return cache_from_env()
 
-        return "DejaVuSans", "DejaVuSans-Bold"
 
-    except Exception as e:
-        # Font yüklenemezse hata ver ama yine de PDF oluşsun
-        st.warning(f"Türkçe font yüklenemedi: {e}. Standart font kullanılacak.")
-        return "Helvetica", "Helvetica-Bold"
+@st.cache_resource
+def get_grid_cache():
+    # Büyük listelerin tablo halleri; oturum durumunda değil, bayt bütçeli ortak önbellekte (TEKLIF_GRID_CACHE_MB)
+    return grid_cache_from_env()
+
+
+@st.cache_resource
+def get_pdf_store():
+    # Oturumlara verilen PDF'ler; oturum/toplam bütçe aşılınca diske taşınır
+    # (TEKLIF_SESSION_PDF_MB, TEKLIF_PDF_MEMORY_MB, TEKLIF_PDF_SPILL_MB)
+    return store_from_env()
+
+
+def keep_session_pdf(state_key, pdf_bytes):
+    # Oturumda yalnızca depo anahtarı tutulur; eski PDF depodan bırakılır
+    store = get_pdf_store()
+    old_key = st.session_state.get(state_key)
+    if old_key:
+        store.discard(old_key)
+    st.session_state[state_key] = store.put(st.session_state.session_key, pdf_bytes)
+
+
+def drop_session_pdf(state_key):
+    key = st.session_state.pop(state_key, None)
+    if key:
+        get_pdf_store().discard(key)
+
 
+def load_pdf(store, key, archive=None, quote_no=None):
+    # İndirme tıklandığında çağrılır; depodan atılmışsa arşivdeki kopya verilir
+    pdf_bytes = store.get(key) if key else None
+    if pdf_bytes is None and archive is not None and quote_no:
+        pdf_bytes = archive.pdf(quote_no)
+    return pdf_bytes or b""
 
-FONT_NORMAL, FONT_BOLD = setup_fonts()
+
+@st.cache_resource
+def get_pdf_jobs():
+    # Tüm oturumların paylaştığı sınırlı PDF işçi havuzu (TEKLIF_PDF_WORKERS, TEKLIF_PDF_QUEUE)
+    from teklif.jobs import jobs_from_env
+    return jobs_from_env()
+
+
+@st.cache_resource
+def get_catalog():
+    # Tek SQLite bağlantısı tüm oturumlarca paylaşılır; açılamazsa katalog devre dışı
+    try:
+        return Catalog()
+    except Exception:
+        return None
+
+
+@st.cache_resource
+def get_archive():
+    # Verilen tekliflerin yalnızca eklemeli arşivi; açılamazsa teklifler arşivlenmez
+    try:
+        return QuoteArchive()
+    except Exception:
+        return None
+
+
+def pick_from_catalog():
+    catalog = get_catalog()
+    choice = st.session_state.get('catalog_choice')
+    if catalog is not None and choice:
+        st.session_state.catalog_pick = catalog.get(choice)
 
 
 # Başlık
@@ -74,8 +144,132 @@ st.markdown('<div class="main-header"><h1>🌶️ FİYAT TEKLİFİ OLUŞTURUCU</
 if 'products' not in st.session_state:
     st.session_state.products = []
 
-if 'editing_index' not in st.session_state:
-    st.session_state.editing_index = None
+if 'grid_version' not in st.session_state:
+    st.session_state.grid_version = 0
+
+if 'catalog_pick' not in st.session_state:
+    st.session_state.catalog_pick = None
+
+# PDF deposunda bu oturuma ait kayıtları ayırmak için
+if 'session_key' not in st.session_state:
+    st.session_state.session_key = uuid.uuid4().hex
+
+# Toplu fiyat önizlemesinde gösterilecek en fazla satır (uygulamada tamamı yeniden hesaplanır)
+REPRICE_PREVIEW_ROWS = 200
+REPRICE_INPUT_KEYS = ('reprice_filter', 'reprice_percent', 'reprice_change_vat', 'reprice_new_vat')
+
+
+def reprice_frames(target, name_filter, percent, vat_rate):
+    # (yeni fiyatlar, değişen satırlar); katalog hedefinde yalnızca filtreye uyanlar okunur
+    from teklif.pricing import name_mask, price_diff, products_to_frame, reprice
+    
+    if target == "Katalog":
+        catalog = get_catalog()
+        before = products_to_frame(catalog.products(name_filter) if catalog else [])
+    else:
+        before = products_to_frame(st.session_state.products)
+    after = reprice(before, name_mask(before, name_filter), percent=percent, vat_rate=vat_rate)
+    return after, price_diff(before, after)
+
+
+@st.fragment
+def reprice_panel():
+    # Toplu fiyat güncelleme: tüm satırlar tek vektörel hesapla yeniden fiyatlanır.
+    # Hesap her rerun'da değil, yalnızca "Önizle" ve "Uygula" ile yapılır.
+    with st.expander("💹 Toplu Fiyat Güncelleme"):
+        if st.session_state.pop('reprice_reset', False):
+            # Uygulanan değişim ikinci tıklamada tekrar eklenmesin diye girdiler sıfırlanır
+            for key in REPRICE_INPUT_KEYS:
+                st.session_state.pop(key, None)
+        
+        with st.form("reprice_form"):
+            reprice_target = st.radio("Uygulanacak yer", ["Teklifteki ürünler", "Katalog"], horizontal=True,
+                                      key="reprice_target")
+            reprice_filter = st.text_input("Ürün adı içerir", placeholder="Örnek: biber (boşsa hepsi)",
+                                           key="reprice_filter")
+            reprice_percent = st.number_input("Fiyat değişimi (%)", value=0.0, min_value=-100.0, step=1.0,
+                                              key="reprice_percent",
+                                              help="Zam için pozitif, indirim için negatif girin")
+            change_vat = st.checkbox("KDV oranını değiştir", key="reprice_change_vat")
+            new_vat = st.number_input("Yeni KDV (%)", value=10.0, min_value=0.0, max_value=100.0,
+                                      step=1.0, key="reprice_new_vat",
+                                      help="Yalnızca 'KDV oranını değiştir' işaretliyse uygulanır")
+            previewed = st.form_submit_button("🔍 Önizle")
+        
+        if previewed:
+            st.session_state.pop('reprice_preview', None)
+            if reprice_percent or change_vat:
+                params = {
+                    'target': reprice_target,
+                    'name_filter': reprice_filter,
+                    'percent': reprice_percent,
+                    'vat_rate': new_vat if change_vat else None,
+                }
+                from teklif.pricing import invalid_rows
+                
+                after, diff = reprice_frames(**params)
+                st.session_state.reprice_preview = {
+                    'params': params,
+                    'count': len(diff),
+                    'rows': diff.head(REPRICE_PREVIEW_ROWS),
+                    'errors': invalid_rows(after.loc[diff.index]),
+                }
+        
+        message = st.session_state.pop('reprice_message', None)
+        if message:
+            st.success(message)
+        
+        # Önizleme: onaylanmadan hiçbir şey değişmez
+        preview = st.session_state.get('reprice_preview')
+        if preview is None:
+            return
+        st.caption(f"{preview['count']} ürünün fiyatı değişecek")
+        if not preview['count']:
+            return
+        st.dataframe(
+            preview['rows'].rename(columns={
+                'name': 'Ürün',
+                'unit_price_old': 'KG Fiyatı (eski)',
+                'unit_price_new': 'KG Fiyatı (yeni)',
+                'vat_rate_old': 'KDV % (eski)',
+                'vat_rate_new': 'KDV % (yeni)',
+                'vat_price_old': 'KDV Dahil (eski)',
+                'vat_price_new': 'KDV Dahil (yeni)',
+                'package_price_incl_vat_old': 'Ambalaj KDV Dahil (eski)',
+                'package_price_incl_vat_new': 'Ambalaj KDV Dahil (yeni)',
+            }),
+            hide_index=True,
+        )
+        if preview['count'] > REPRICE_PREVIEW_ROWS:
+            st.caption(f"İlk {REPRICE_PREVIEW_ROWS} ürün gösteriliyor.")
+        if preview['errors']:
+            # Ekleme formu ve tablo gibi toplu güncelleme de kurallara uymayan fiyat yazamaz
+            name, error = preview['errors'][0]
+            st.error(f"{len(preview['errors'])} ürün kurallara uymuyor, uygulanamaz. {name}: {error}")
+            return
+        if st.button("✅ Değişiklikleri Uygula"):
+            from teklif.pricing import frame_to_products, invalid_rows
+            
+            params = preview['params']
+            after, diff = reprice_frames(**params)
+            errors = invalid_rows(after.loc[diff.index])
+            if errors:
+                # Önizlemeden sonra liste ya da katalog değişmiş olabilir
+                st.error(f"{len(errors)} ürün kurallara uymuyor, uygulanamaz. {errors[0][0]}: {errors[0][1]}")
+                return
+            if params['target'] == "Katalog":
+                catalog = get_catalog()
+                if catalog is not None:
+                    catalog.upsert_many(frame_to_products(after.loc[diff.index]))
+            else:
+                st.session_state.products = frame_to_products(after)
+                st.session_state.grid_version += 1
+            st.session_state.pop('reprice_preview', None)
+            st.session_state.reprice_reset = True
+            st.session_state.reprice_message = f"{len(diff)} ürün güncellendi!"
+            # Teklif listesi değiştiyse ürün tablosu ve PDF bölümü de yenilensin
+            st.rerun(scope="fragment" if params['target'] == "Katalog" else "app")
+
 
 # Sidebar ile düzen
 with st.sidebar:
@@ -84,10 +278,286 @@ with st.sidebar:
     if st.button("🗑️ Tüm Ürünleri Temizle"):
         if st.session_state.products:
             st.session_state.products.clear()
-            st.session_state.editing_index = None
+            st.session_state.grid_version += 1
             st.success("Tüm ürünler silindi!")
         else:
             st.info("Zaten hiç ürün yok!")
+    
+    reprice_panel()
+
+# Ürün tablosu kolonları (iç ad -> görünen ad)
+GRID_COLUMNS = {
+    'name': 'Ürün Adı',
+    'unit_price': 'KG Fiyatı KDV Hariç (TL)',
+    'vat_rate': 'KDV %',
+    'vat_price': 'KG Fiyatı KDV Dahil (TL)',
+    'package_kg': 'Ambalaj (kg)',
+    'package_price_excl_vat': 'Ambalaj Fiyatı KDV Hariç (TL)',
+    'package_price_incl_vat': 'Ambalaj Fiyatı KDV Dahil (TL)',
+}
+
+
+# Bu satır sayısından uzun ürün listeleri tabloya DataFrame olarak verilir
+GRID_FRAME_ROWS = 500
+
+# Bir oturumun teklif listesindeki en fazla ürün (içe aktarmada fazlası yalnızca kataloğa yazılır)
+MAX_SESSION_PRODUCTS = 5000
+
+
+@st.fragment
+def product_panel():
+    # Tablodaki tıklamalar yalnızca bu paneli yeniden çalıştırır, tüm sayfayı değil
+    st.subheader("📦 Eklenen Ürünler")
+    
+    grid_cache = get_grid_cache()
+    if not st.session_state.products:
+        grid_cache.discard(st.session_state.session_key)
+        st.info("Henüz ürün eklenmemiş. Soldan ürün bilgilerini doldurup 'Ürün Ekle' butonuna tıklayın.")
+        return
+    
+    if len(st.session_state.products) > GRID_FRAME_ROWS:
+        # Büyük listelerde Streamlit'in dönüşümü yerine doğrudan DataFrame vermek daha hızlı.
+        # Tablo yalnızca liste değiştiğinde (grid_version) yeniden kurulur, her rerun'da değil.
+        grid_token = (st.session_state.grid_version, id(st.session_state.products),
+                      len(st.session_state.products))
+        grid = grid_cache.get(st.session_state.session_key, grid_token)
+        if grid is None:
+            from teklif.pricing import products_to_frame
+            
+            grid = products_to_frame(st.session_state.products).rename(columns=GRID_COLUMNS)
+            grid.insert(0, 'Seç', False)
+            grid_cache.put(st.session_state.session_key, grid_token, grid)
+    else:
+        grid_cache.discard(st.session_state.session_key)
+        # Küçük listeler düz sözlük listesiyle beslenir; bu kod DataFrame kurmaz
+        grid = [
+            {'Seç': False, **{label: product[column] for column, label in GRID_COLUMNS.items()}}
+            for product in st.session_state.products
+        ]
+    
+    # Tek düzenlenebilir tablo: temel alanlar düzenlenir, türetilmiş fiyatlar hesaplanır
+    edited = st.data_editor(
+        grid,
+        key=f"product_grid_{st.session_state.grid_version}",
+        use_container_width=True,
+        hide_index=True,
+        num_rows="fixed",
+        disabled=[GRID_COLUMNS[c] for c in DERIVED_COLUMNS],
+        column_config={
+            'Seç': st.column_config.CheckboxColumn(width="small"),
+            GRID_COLUMNS['name']: st.column_config.TextColumn(required=True),
+            GRID_COLUMNS['unit_price']: st.column_config.NumberColumn(min_value=0.0, format="%.2f", required=True),
+            GRID_COLUMNS['vat_rate']: st.column_config.NumberColumn(min_value=0.0, max_value=100.0, format="%.0f", required=True),
+            GRID_COLUMNS['vat_price']: st.column_config.NumberColumn(format="%.2f"),
+            GRID_COLUMNS['package_kg']: st.column_config.NumberColumn(min_value=0.0, format="%.0f"),
+            GRID_COLUMNS['package_price_excl_vat']: st.column_config.NumberColumn(format="%.2f"),
+            GRID_COLUMNS['package_price_incl_vat']: st.column_config.NumberColumn(format="%.2f"),
+        },
+    )
+    
+    if isinstance(edited, list):
+        selected = [bool(row['Seç']) for row in edited]
+    else:
+        selected = edited['Seç'].tolist()
+    selected_count = sum(selected)
+    
+    col_save, col_delete = st.columns([1, 1])
+    with col_save:
+        if st.button("💾 Değişiklikleri Kaydet"):
+            products = []
+            rows = edited if isinstance(edited, list) else edited.to_dict('records')
+            for line, row in enumerate(rows, start=1):
+                name = row[GRID_COLUMNS['name']] or ""
+                unit_price = row[GRID_COLUMNS['unit_price']] or 0.0
+                vat_rate = row[GRID_COLUMNS['vat_rate']] or 0.0
+                package_kg = row[GRID_COLUMNS['package_kg']] or 0.0
+                product_error = validate_product(name, unit_price, vat_rate, package_kg)
+                if product_error:
+                    st.error(f"{line}. satır: {product_error}")
+                    break
+                products.append(make_product(name, unit_price, vat_rate, package_kg))
+            else:
+                st.session_state.products = products
+                st.session_state.grid_version += 1
+                st.rerun(scope="fragment")
+    
+    with col_delete:
+        if st.button(f"🗑️ Seçilenleri Sil ({selected_count})", disabled=not selected_count):
+            st.session_state.products = [
+                product for product, is_selected in zip(st.session_state.products, selected)
+                if not is_selected
+            ]
+            st.session_state.grid_version += 1
+            # Liste boşaldıysa PDF bölümü de güncellensin
+            st.rerun(scope="fragment" if st.session_state.products else "app")
+    
+    st.write(f"**Toplam: {len(st.session_state.products)} ürün**")
+
+
+@st.fragment
+def import_panel():
+    # Yükleme ve ilerleme yalnızca bu paneli yeniden çalıştırır
+    with st.expander("📥 Fiyat Listesi İçe Aktar"):
+        uploaded = st.file_uploader(
+            "CSV veya Excel (XLSX)",
+            type=["csv", "xlsx"],
+            help="Kolonlar: Ürün Adı, KG Fiyatı, KDV, Ambalaj (kg). Ürünler kataloğa kaydedilir.",
+        )
+        add_to_quote = st.checkbox(f"Teklif listesine de ekle (liste en fazla {MAX_SESSION_PRODUCTS} ürün)")
+        
+        if uploaded is not None and st.button("📥 İçe Aktar"):
+            from teklif.importer import import_price_list
+            
+            catalog = get_catalog()
+            if catalog is None:
+                st.error("Katalog veritabanı açılamadı!")
+                return
+            
+            progress_bar = st.progress(0.0, text="İçe aktarılıyor...")
+            quote_rows = []
+            # Listede kalan yer; birden çok içe aktarma da sınırı aşamaz
+            quote_room = max(MAX_SESSION_PRODUCTS - len(st.session_state.products), 0) if add_to_quote else 0
+            
+            def sink(products):
+                # Her parça doğrudan kataloğa yazılır, oturum belleğinde birikmez
+                catalog.upsert_many(products)
+                quote_rows.extend(products[:quote_room - len(quote_rows)])
+            
+            def progress(line, imported):
+                done = uploaded.tell() / uploaded.size if uploaded.size else 1.0
+                progress_bar.progress(min(done, 1.0), text=f"{line}. satır, {imported} ürün aktarıldı")
+            
+            try:
+                result = import_price_list(uploaded, uploaded.name, sink, progress=progress)
+            except Exception as e:
+                st.error(f"İçe aktarma hatası: {e}")
+                return
+            progress_bar.empty()
+            st.session_state.last_import = result
+            st.session_state.last_import_skipped = result.imported - len(quote_rows) if add_to_quote else 0
+            
+            if quote_rows:
+                st.session_state.products.extend(quote_rows)
+                st.session_state.grid_version += 1
+                st.rerun(scope="app")
+        
+        result = st.session_state.get('last_import')
+        if result is not None:
+            st.success(f"{result.imported} ürün aktarıldı.")
+            skipped = st.session_state.get('last_import_skipped')
+            if skipped:
+                st.info(f"Teklif listesi sınırı ({MAX_SESSION_PRODUCTS} ürün) nedeniyle {skipped} ürün "
+                        f"yalnızca kataloğa eklendi.")
+            if result.error_count:
+                st.warning(f"{result.error_count} satır hatalı, atlandı.")
+                st.dataframe(
+                    [{'Satır': e.line, 'Hata': e.message} for e in result.errors],
+                    hide_index=True,
+                )
+
+
+ARCHIVE_RESULTS = 50
+
+
+@st.fragment
+def archive_panel():
+    # Arama ve yeniden üretim yalnızca bu paneli yeniden çalıştırır
+    with st.expander("🗄️ Teklif Arşivi"):
+        archive = get_archive()
+        if archive is None:
+            st.error("Teklif arşivi açılamadı!")
+            return
+        
+        customer_query = st.text_input("Müşteri", key="archive_customer", placeholder="Örn: Saloon Burger")
+        product_query = st.text_input("Ürün", key="archive_product", placeholder="Örn: Pul Biber")
+        # Arşiv her rerun'da değil, yalnızca arama girildiğinde sorgulanır
+        if not (customer_query.strip() or product_query.strip()):
+            st.caption("Teklifleri listelemek için müşteri ya da ürün adı girin.")
+            return
+        quotes = archive.find(customer_query, product_query, limit=ARCHIVE_RESULTS)
+        if not quotes:
+            st.caption("Eşleşen teklif yok.")
+            return
+        
+        st.dataframe(
+            [
+                {
+                    'Teklif No': q['quote_no'],
+                    'Tarih': q['issued_at'].replace('T', ' ')[:16],
+                    'Müşteri': q['customer'],
+                    'Ürün': q['item_count'],
+                    'PDF (KB)': round(q['size'] / 1024, 1) if q['size'] else None,
+                }
+                for q in quotes
+            ],
+            hide_index=True,
+        )
+        quote_no = st.selectbox("Teklif", [q['quote_no'] for q in quotes], key="archive_choice")
+        
+        selected = next(q for q in quotes if q['quote_no'] == quote_no)
+        store_key = None
+        if not selected['stored']:
+            if st.session_state.get('archive_pdf_quote') == quote_no:
+                store_key = st.session_state.get('archive_pdf_key')
+            # PDF saklanmamışsa arşivdeki girdilerden aynı numarayla yeniden üretilir
+            if store_key not in get_pdf_store() and st.button("🔄 Yeniden Oluştur"):
+                with st.spinner("PDF hazırlanıyor..."):
+                    # Renderer arşivdeki tüm seçeneklerle (logo, filigran, kompakt) kurulur
+                    pdf_bytes = archive.rerender(quote_no)
+                keep_session_pdf('archive_pdf_key', pdf_bytes)
+                st.session_state.archive_pdf_quote = quote_no
+                store_key = st.session_state.archive_pdf_key
+        if selected['stored'] or store_key in get_pdf_store():
+            # Baytlar yalnızca tıklandığında okunur, oturumda tutulmaz
+            st.download_button(
+                label="📥 Arşivden İndir",
+                data=partial(load_pdf, get_pdf_store(), store_key, archive, quote_no),
+                file_name=f"{quote_no}.pdf",
+                mime="application/pdf",
+            )
+
+
+with st.sidebar:
+    import_panel()
+    archive_panel()
+    
+    # Operatörler için önbellek durumu
+    with st.expander("⚙️ PDF Önbelleği"):
+        cache_stats = get_pdf_cache().stats()
+        st.write(
+            f"**İsabet:** {cache_stats['hits']}  \n"
+            f"**Iskalama:** {cache_stats['misses']}  \n"
+            f"**İsabet oranı:** %{cache_stats['hit_rate'] * 100:.0f}  \n"
+            f"**Kayıt:** {cache_stats['entries']} PDF, "
+            f"{cache_stats['bytes'] / 1024 / 1024:.1f} / {cache_stats['max_bytes'] / 1024 / 1024:.0f} MB  \n"
+            f"**Atılan:** {cache_stats['evictions']}"
+        )
+        if st.button("Önbelleği Temizle"):
+            get_pdf_cache().clear()
+        
+        # Oturumlara verilen PDF'ler: bellek bütçesi aşılınca diske taşınır
+        store_stats = get_pdf_store().stats()
+        session_usage = get_pdf_store().session_usage(st.session_state.session_key)
+        st.write(
+            f"**Bu oturum:** {session_usage['entries']} PDF, "
+            f"{session_usage['memory_bytes'] / 1024:.0f} KB bellekte, "
+            f"{session_usage['spilled_bytes'] / 1024:.0f} KB diskte "
+            f"(bütçe {store_stats['session_max_bytes'] / 1024 / 1024:.0f} MB)  \n"
+            f"**Tüm oturumlar:** {store_stats['sessions']} oturum, "
+            f"{store_stats['memory_bytes'] / 1024 / 1024:.1f} / {store_stats['max_bytes'] / 1024 / 1024:.0f} MB bellekte, "
+            f"{store_stats['spilled_bytes'] / 1024 / 1024:.1f} MB diskte  \n"
+            f"**Diske taşınan:** {store_stats['spills']}, **atılan:** {store_stats['evictions']}"
+        )
+        
+        # Büyük ürün listelerinin tablo halleri de oturumda değil, ortak bütçede tutulur
+        grid_stats = get_grid_cache().stats()
+        st.write(
+            f"**Ürün listesi:** {len(st.session_state.products)} / {MAX_SESSION_PRODUCTS} ürün, "
+            f"tablo {get_grid_cache().session_bytes(st.session_state.session_key) / 1024:.0f} KB  \n"
+            f"**Tablo önbelleği:** {grid_stats['entries']} oturum, "
+            f"{grid_stats['bytes'] / 1024 / 1024:.1f} / {grid_stats['max_bytes'] / 1024 / 1024:.0f} MB, "
+            f"atılan {grid_stats['evictions']}"
+        )
 
 # Ana içerik - 2 sütun
 col1, col2 = st.columns([1, 1])
@@ -97,30 +567,46 @@ with col1:
     customer_company = st.text_input("Müşteri Firma Adı", placeholder="Örnek: Saloon Burger")
     contact_person = st.text_input("İlgili Kişi", placeholder="Örnek: Mehmet Yılmaz")
     
-    st.subheader("🛒 Ürün Ekle/Düzenle")
+    st.subheader("🛒 Ürün Ekle")
     
-    # Düzenleme modunda mı kontrol et
-        # Düzenleme / yeni ekleme için varsayılan değerler
-    if st.session_state.editing_index is not None:
-        editing_product = st.session_state.products[st.session_state.editing_index]
-        default_name = editing_product['name']
-        default_price = editing_product['unit_price']
-        default_vat = editing_product['vat_rate']
-        # Yeni eklenen alan: ambalaj kg
-        default_package_kg = editing_product.get('package_kg', 0.0)
-        button_text = "✏️ Ürünü Güncelle"
-        button_color = "secondary"
+    # Yeni ekleme için varsayılan değerler (düzenleme sağdaki tablodan yapılır)
+    if st.session_state.catalog_pick:
+        # Katalogdan seçilen ürünün bilgileriyle doldur
+        catalog_pick = st.session_state.catalog_pick
+        default_name = catalog_pick['name']
+        default_price = catalog_pick['unit_price']
+        default_vat = catalog_pick['vat_rate']
+        default_package_kg = catalog_pick['package_kg']
     else:
         default_name = ""
         default_price = 0.0
         default_vat = 1.0
         default_package_kg = 0.0
-        button_text = "➕ Ürün Ekle"
-        button_color = "primary"
     
     # Ürün adı
     product_name = st.text_input("Ürün Adı", value=default_name, placeholder="Örnek: Karabiber")
     
+    # Katalogdan otomatik tamamlama (yalnızca önekle eşleşen ilk ürünler okunur)
+    catalog = get_catalog()
+    if catalog is not None and product_name.strip():
+        # Tam eşleşen ürün de önerilir (adı eksiksiz yazan da fiyatları doldurabilsin);
+        # yalnızca zaten seçilmiş ve alanları doldurmuş olan ürün gizlenir
+        picked = st.session_state.catalog_pick
+        picked_key = turkish_fold(picked['name']) if picked else None
+        suggestions = [
+            match['name'] for match in catalog.search(product_name, limit=10)
+            if turkish_fold(match['name']) != picked_key
+        ]
+        if suggestions:
+            st.selectbox(
+                "Katalogdan seç",
+                suggestions,
+                index=None,
+                placeholder="Fiyat bilgilerini katalogdan doldurmak için seçin",
+                key="catalog_choice",
+                on_change=pick_from_catalog,
+            )
+    
     # KG fiyatı ve KDV
     col_price, col_vat = st.columns([2, 1])
     with col_price:
@@ -148,357 +634,169 @@ with col1:
         help="Sadece kilogram bazlı satılan ürünler için 0 bırakın. Örn: 5, 10, 20"
     )
     
-    # Butonlar
-    col_btn1, col_btn2 = st.columns([1, 1])
-    
-    with col_btn1:
-        if st.button(button_text, type=button_color):
-            if product_name.strip():
-                # KG bazında KDV dahil fiyat
-                vat_price = unit_price * (1 + vat_rate / 100)
-                
-                # Ambalaj fiyatı hesaplama
-                if package_kg and package_kg > 0:
-                    package_price_excl_vat = unit_price * package_kg
-                    package_price_incl_vat = vat_price * package_kg
-                else:
-                    package_price_excl_vat = 0.0
-                    package_price_incl_vat = 0.0
-                
-                # Ürün sözlüğü
-                product = {
-                    'name': product_name.strip(),
-                    'unit_price': unit_price,
-                    'vat_rate': vat_rate,
-                    'vat_price': vat_price,
-                    'package_kg': package_kg,
-                    'package_price_excl_vat': package_price_excl_vat,
-                    'package_price_incl_vat': package_price_incl_vat,
-                }
-                
-                if st.session_state.editing_index is not None:
-                    # Güncelleme
-                    st.session_state.products[st.session_state.editing_index] = product
-                    st.session_state.editing_index = None
-                    st.success(f"'{product_name}' güncellendi!")
-                    st.rerun()
-                else:
-                    # Yeni ekleme
-                    st.session_state.products.append(product)
-                    st.rerun()
-            else:
-                st.error("Ürün adı boş olamaz!")
-
-    
-    with col_btn2:
-        if st.session_state.editing_index is not None:
-            if st.button("❌ İptal"):
-                st.session_state.editing_index = None
-                st.rerun()
-
-with col2:
-    st.subheader("📦 Eklenen Ürünler")
-    
-    if st.session_state.products:
-        # Ürünleri DataFrame olarak göster
-        df_data = []
-        for i, product in enumerate(st.session_state.products):
-            package_kg = product.get('package_kg', 0.0) or 0.0
-            if package_kg > 0:
-                ambalaj_str = f"{package_kg:.0f} kg"
-                pkg_excl = product.get(
-                    'package_price_excl_vat',
-                    product['unit_price'] * package_kg
-                )
-                pkg_incl = product.get(
-                    'package_price_incl_vat',
-                    product['vat_price'] * package_kg
-                )
-                pkg_excl_str = f"{pkg_excl:.2f}"
-                pkg_incl_str = f"{pkg_incl:.2f}"
-            else:
-                ambalaj_str = ""
-                pkg_excl_str = ""
-                pkg_incl_str = ""
+    # Buton
+    if st.button("➕ Ürün Ekle", type="primary"):
+        product_error = validate_product(product_name, unit_price, vat_rate, package_kg)
+        if product_error is None and len(st.session_state.products) >= MAX_SESSION_PRODUCTS:
+            product_error = f"Teklif listesi en fazla {MAX_SESSION_PRODUCTS} ürün içerebilir!"
+        if product_error is None:
+            # Ürün sözlüğü (KDV dahil ve ambalaj fiyatlarıyla)
+            product = make_product(product_name, unit_price, vat_rate, package_kg)
             
-            df_data.append({
-                'No': i + 1,
-                'Ürün Adı': product['name'],
-                'KG Fiyatı KDV Hariç (TL)': f"{product['unit_price']:.2f}",
-                'KDV %': f"{product['vat_rate']:.0f}",
-                'KG Fiyatı KDV Dahil (TL)': f"{product['vat_price']:.2f}",
-                'Ambalaj (kg)': ambalaj_str,
-                'Ambalaj Fiyatı KDV Hariç (TL)': pkg_excl_str,
-                'Ambalaj Fiyatı KDV Dahil (TL)': pkg_incl_str,
-            })
-        
-        df = pd.DataFrame(df_data)
-        st.dataframe(df, use_container_width=True, hide_index=True)
-
-        
-        # Her ürün için düzenle/sil butonları
-        st.write("**İşlemler:**")
-        for i, product in enumerate(st.session_state.products):
-            col_edit, col_delete, col_info = st.columns([1, 1, 3])
-            
-            with col_edit:
-                if st.button(f"✏️", key=f"edit_{i}", help="Düzenle"):
-                    st.session_state.editing_index = i
-                    st.rerun()
-            
-            with col_delete:
-                if st.button(f"🗑️", key=f"delete_{i}", help="Sil"):
-                    st.session_state.products.pop(i)
-                    if st.session_state.editing_index == i:
-                        st.session_state.editing_index = None
-                    elif st.session_state.editing_index is not None and st.session_state.editing_index > i:
-                        st.session_state.editing_index -= 1
-                    st.success(f"'{product['name']}' silindi!")
-                    st.rerun()
+            # Kataloğa kaydet; bir sonraki teklifte otomatik tamamlansın
+            if catalog is not None:
+                try:
+                    catalog.upsert(product)
+                except Exception:
+                    pass
+            st.session_state.catalog_pick = None
             
-            with col_info:
-                st.write(f"{i+1}. {product['name']}")
-        
-        st.write(f"**Toplam: {len(st.session_state.products)} ürün**")
-        
-    else:
-        st.info("Henüz ürün eklenmemiş. Soldan ürün bilgilerini doldurup 'Ürün Ekle' butonuna tıklayın.")
+            # Yeni ekleme
+            st.session_state.products.append(product)
+            st.session_state.grid_version += 1
+            st.rerun()
+        else:
+            st.error(product_error)
+
+with col2:
+    product_panel()
 
 # PDF Oluşturma
 st.divider()
 st.subheader("📄 PDF Oluştur")
 
-if st.session_state.products and customer_company.strip():
-    if st.button("📋 PDF TEKLİFİ OLUŞTUR", type="primary", use_container_width=True):
-        try:
-            # PDF oluşturma fonksiyonları
-            def find_logo_file():
-                possible_names = ['logo.png', 'logo.jpg', 'logo.jpeg', 'Logo.png', 'LOGO.png']
-                for name in possible_names:
-                    if os.path.exists(name):
-                        return name
-                return None
-            
-            def create_watermark_logo():
-                logo_file = find_logo_file()
-                if not logo_file:
-                    return None
-                
-                try:
-                    with PILImage.open(logo_file) as original_img:
-                        if original_img.mode != 'RGBA':
-                            img = original_img.convert('RGBA')
-                        else:
-                            img = original_img.copy()
-                        
-                        max_size = 350
-                        img.thumbnail((max_size, max_size), PILImage.Resampling.LANCZOS)
-                        
-                        canvas_size = 400
-                        canvas = PILImage.new('RGBA', (canvas_size, canvas_size), (0, 0, 0, 0))
-                        
-                        x = (canvas_size - img.size[0]) // 2
-                        y = (canvas_size - img.size[1]) // 2
-                        canvas.paste(img, (x, y), img)
-                        
-                        pixels = canvas.load()
-                        for i in range(canvas.size[0]):
-                            for j in range(canvas.size[1]):
-                                r, g, b, a = pixels[i, j]
-                                pixels[i, j] = (r, g, b, int(a * 0.25))
-                        
-                        temp_logo_path = "temp_watermark.png"
-                        canvas.save(temp_logo_path, 'PNG')
-                        return temp_logo_path
-                except:
-                    return None
-            
-            # PDF oluştur
-            filename = f"fiyat_teklifi_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
-            doc = SimpleDocTemplate(
-                filename,
-                pagesize=A4,
-                topMargin=2*cm,
-                bottomMargin=2*cm,
-                leftMargin=2.5*cm,
-                rightMargin=2.5*cm,
-            )
-            story = []
-            
-            # PDF Stiller
-            company_style = ParagraphStyle(
-                'CompanyStyle',
-                fontName=FONT_BOLD,
-                fontSize=16,
-                leading=20,  # <-- SATIR ARALIĞI (fontSize'tan büyük olsun)
-                spaceAfter=25,
-                alignment=TA_CENTER,
-                textColor=colors.Color(0.86, 0.24, 0.26)
-            )
 
-            
-            title_style = ParagraphStyle('TitleStyle', fontName=FONT_BOLD, fontSize=18,
-                                        spaceAfter=20, alignment=TA_CENTER,
-                                        textColor=colors.Color(0.86, 0.24, 0.26))
-            
-            left_style = ParagraphStyle('LeftStyle', fontName=FONT_NORMAL, fontSize=10,
-                                       spaceAfter=4, alignment=TA_LEFT, leftIndent=0)
-            
-            heading_style = ParagraphStyle('HeadingStyle', fontName=FONT_BOLD, fontSize=12,
-                                          spaceAfter=8, textColor=colors.Color(0.86, 0.24, 0.26))
-            
-            normal_style = ParagraphStyle(
-                'NormalStyle',
-                fontName=FONT_NORMAL,
-                fontSize=10,
-                spaceAfter=6,
-                leftIndent=0,   # Notlar paragrafı tablonun hizasında başlasın
-                alignment=TA_LEFT
-            )
+def show_pdf_result():
+    result = st.session_state.get('pdf_result')
+    if result is None:
+        return
+    if result.get('error'):
+        st.error(f"PDF oluşturma hatası: {result['error']}")
+        return
+    quote_info = f"Teklif No: {result['quote_no']}, " if result.get('quote_no') else ""
+    st.success(f"PDF başarıyla oluşturuldu! ({quote_info}{result['size'] / 1024:.1f} KB)")
+    
+    store = get_pdf_store()
+    pdf_key = st.session_state.get('pdf_key')
+    archive = get_archive() if result.get('quote_no') else None
+    if pdf_key not in store and archive is None:
+        # Bellek ve disk bütçesi aşıldığında en eski PDF'ler atılır
+        st.warning("PDF artık bellekte değil, lütfen yeniden oluşturun.")
+        return
+    st.download_button(
+        label="📥 PDF'i İndir",
+        data=partial(load_pdf, store, pdf_key, archive, result.get('quote_no')),
+        file_name=result['file_name'],
+        mime="application/pdf"
+    )
 
-            
-            # İçerik
-            story.append(Paragraph("BULDUMLAR BİBER & BAHARAT<br/>ENTEGRE TESİSLERİ", company_style))
-            story.append(Paragraph("FİYAT TEKLİFİ", title_style))
-            story.append(Spacer(1, 15))
-            
-            today = datetime.now()
-            story.append(Paragraph(f"<b>Tarih:</b> {today.strftime('%d/%m/%Y')}", left_style))
-            story.append(Paragraph(f"<b>Teklif No:</b> BLD-{today.strftime('%Y%m%d')}-{today.strftime('%H%M')}", left_style))
-            story.append(Spacer(1, 20))
-            
-            story.append(Paragraph("SAYIN", heading_style))
-            customer_info = customer_company
-            if contact_person.strip():
-                customer_info += f"<br/>Att: {contact_person}"
-            story.append(Paragraph(customer_info, normal_style))
-            story.append(Spacer(1, 20))
-            
-            story.append(Paragraph("FİYAT LİSTESİ (KG ve Ambalaj Bazında)", heading_style))
-            story.append(Spacer(1, 10))
-            
-            # Tablo başlıkları
-            table_data = [
-                [
-                    'Ürün Adı',
-                    'KG Fiyatı\n(KDV Hariç)',
-                    'KDV %',
-                    'KG Fiyatı\n(KDV Dahil)',
-                    'Ambalaj',
-                    'Ambalaj Fiyatı\n(KDV Dahil)'
-                ]
-            ]
-            
-            # Ürün satırları
-            for product in st.session_state.products:
-                package_kg = product.get('package_kg', 0.0) or 0.0
-                if package_kg > 0:
-                    ambalaj = f"{package_kg:.0f} kg"
-                    pkg_incl = product.get(
-                        'package_price_incl_vat',
-                        product['vat_price'] * package_kg
-                    )
-                    pkg_incl_str = f"{pkg_incl:.2f} TL"
-                else:
-                    ambalaj = "-"
-                    pkg_incl_str = "-"
-                
-                table_data.append([
-                    product['name'],
-                    f"{product['unit_price']:.2f} TL/kg",
-                    f"%{product['vat_rate']:.0f}",
-                    f"{product['vat_price']:.2f} TL/kg",
-                    ambalaj,
-                    pkg_incl_str
-                ])
-            
-                        # 6 kolon için genişlikleri, sayfanın yazı alanına göre ayarla
-            # doc.width = sayfanın sol ve sağ marjı arasındaki kullanılabilir genişlik
-            available_width = doc.width
-
-            # Kolon genişlik oranları (toplamı 1 olacak)
-            col_width_fractions = [
-                0.28,  # Ürün Adı (biraz küçülttük)
-                0.16,  # KG Fiyatı (KDV Hariç)
-                0.08,  # KDV %
-                0.16,  # KG Fiyatı (KDV Dahil)
-                0.12,  # Ambalaj
-                0.20,  # Ambalaj Fiyatı (KDV Dahil) 🔥
-            ]
 
-            col_widths = [f * available_width for f in col_width_fractions]
+pdf_job = st.session_state.get('pdf_job')
 
-            product_table = Table(
-                table_data,
-                colWidths=col_widths
-            )
 
-            # TABLOYU SAYFANIN SOL MARJINA HİZALA
-            product_table.hAlign = 'LEFT'
-
-            product_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.Color(0.86, 0.24, 0.26)),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (-1, 0), FONT_BOLD),
-                ('FONTNAME', (0, 1), (-1, -1), FONT_NORMAL),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.Color(1, 0.95, 0.95), colors.white]),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('LEFTPADDING', (0, 0), (-1, -1), 8),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-                ('TOPPADDING', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ]))
-
-            story.append(product_table)
-            story.append(Spacer(1, 25))
+@st.fragment(run_every=1.0 if pdf_job is not None else None)
+def pdf_job_status():
+    # Çalışan iş varsa her saniye yalnızca bu bölüm yenilenir; arayüz kilitlenmez
+    job = st.session_state.get('pdf_job')
+    if job is None:
+        return
+    future = job['future']
+    if not future.done():
+        waited = time.perf_counter() - job['submitted']
+        st.info(f"⏳ PDF hazırlanıyor... {waited:.0f} sn (kuyrukta {get_pdf_jobs().depth()} iş)")
+        return
+    
+    from teklif.render import quote_filename
+    
+    st.session_state.pdf_job = None
+    try:
+        pdf_bytes = future.result()
+    except Exception as e:
+        st.session_state.pdf_result = {'error': str(e)}
+        archive = get_archive()
+        if archive is not None and job['quote_no']:
+            # Numara silinemez; arşiv panelinde gösterilmesin diye başarısız işaretlenir
+            archive.mark_failed(job['quote_no'], str(e))
+    else:
+        record('app.pdf_job', time.perf_counter() - job['submitted'])
+        get_pdf_cache().put(job['cache_key'], pdf_bytes, job['issued_at'], job['quote_no'])
+        archive = get_archive()
+        if archive is not None and job['quote_no']:
+            archive.attach_pdf(job['quote_no'], pdf_bytes)
+        keep_session_pdf('pdf_key', pdf_bytes)
+        st.session_state.pdf_result = {
+            'size': len(pdf_bytes),
+            'file_name': quote_filename(job['issued_at']),
+            'customer_company': job['customer_company'],
+            'quote_no': job['quote_no'],
+        }
+    # Sayfanın geri kalanı da sonucu görsün, yoklama dursun
+    st.rerun(scope="app")
 
+
+if st.session_state.products and customer_company.strip():
+    compact_pdf = st.checkbox(
+        "📦 Kompakt çıktı",
+        key="pdf_compact",
+        help="E-posta ve WhatsApp için daha küçük dosya (küçültülmüş filigran)",
+    )
+    if st.button("📋 PDF TEKLİFİ OLUŞTUR", type="primary", use_container_width=True,
+                 disabled=pdf_job is not None):
+        try:
+            from teklif.fonts import setup_fonts
+            from teklif.jobs import QueueFullError
+            from teklif.render import quote_filename
             
-            notes = """<b>NOTLAR:</b><br/>
-            • Fiyatlar Türk Lirası cinsindendir.<br/>
-            • Fiyatlar kilogram ve belirtilen ambalaj bazında verilmiştir.<br/>
-            • Minimum sipariş miktarları için ayrıca bilgi verilecektir.<br/>
-            • Teslim süresi sipariş onayından sonra belirlenecektir."""
-            
-            story.append(Paragraph(notes, normal_style))
-            
-            # Logo watermark
-            def add_logo_watermark(canvas, doc):
-                temp_logo_path = create_watermark_logo()
-                if temp_logo_path and os.path.exists(temp_logo_path):
-                    try:
-                        page_width, page_height = A4
-                        logo_size = 400
-                        x = (page_width - logo_size) / 2
-                        y = (page_height - logo_size) / 2
-                        canvas.drawImage(temp_logo_path, x, y, width=logo_size, height=logo_size, 
-                                       mask='auto', preserveAspectRatio=True)
-                        os.remove(temp_logo_path)
-                    except:
-                        pass
-            
-            # PDF oluştur
-            doc.build(story, onFirstPage=add_logo_watermark, onLaterPages=add_logo_watermark)
-            
-            # İndirme butonu
-            with open(filename, "rb") as pdf_file:
-                pdf_bytes = pdf_file.read()
+            st.session_state.pdf_result = None
+            drop_session_pdf('pdf_key')
+            renderer = get_renderer(compact_pdf)
+            fonts = setup_fonts()
+            if fonts.error and not st.session_state.get('font_warning_shown'):
+                # Font yüklenemezse oturum başına bir kez uyar ama yine de PDF oluşsun
+                st.session_state.font_warning_shown = True
+                st.warning(f"Türkçe font yüklenemedi: {fonts.error}. Standart font kullanılacak.")
             
-            st.success("PDF başarıyla oluşturuldu!")
-            st.download_button(
-                label="📥 PDF'i İndir",
-                data=pdf_bytes,
-                file_name=filename,
-                mime="application/pdf"
+            # Aynı girdilerle bugün üretilmiş teklif varsa önbellekten verilir
+            pdf_cache = get_pdf_cache()
+            issued_at = datetime.now()
+            cache_key = renderer.cache_key(
+                customer_company, contact_person, st.session_state.products, issued_at
             )
-            
-            # Geçici dosyayı temizle
-            if os.path.exists(filename):
-                os.remove(filename)
-                
+            with span('app.pdf_cache'):
+                cached = pdf_cache.get(cache_key)
+            if cached is not None:
+                # PDF'teki numara ilk üretimdeki numaradır; arşivden indirme de onunla çalışır
+                pdf_bytes, issued_at, quote_no = cached
+                keep_session_pdf('pdf_key', pdf_bytes)
+                st.session_state.pdf_result = {
+                    'size': len(pdf_bytes),
+                    'file_name': quote_filename(issued_at),
+                    'customer_company': customer_company,
+                    'quote_no': quote_no,
+                }
+            else:
+                # PDF paylaşılan işçi havuzunda, bu oturumun betik thread'i dışında üretilir.
+                # Kuyrukta yer varsa teklif arşive yazılır ve çakışmayan bir numara alır.
+                future, quote_no = get_pdf_jobs().issue_quote(
+                    get_archive(),
+                    customer_company,
+                    contact_person,
+                    st.session_state.products,
+                    issued_at,
+                    {'compact': compact_pdf},
+                )
+                st.session_state.pdf_job = {
+                    'future': future,
+                    'submitted': time.perf_counter(),
+                    'cache_key': cache_key,
+                    'issued_at': issued_at,
+                    'customer_company': customer_company,
+                    'quote_no': quote_no,
+                }
+                st.rerun()
+        
+        except QueueFullError:
+            st.error("Şu anda çok fazla PDF hazırlanıyor, lütfen birkaç saniye sonra tekrar deneyin.")
         except Exception as e:
             st.error(f"PDF oluşturma hatası: {str(e)}")
 
@@ -508,6 +806,45 @@ else:
     if not customer_company.strip():
         st.warning("PDF oluşturmak için müşteri firma adını girin.")
 
+pdf_job_status()
+show_pdf_result()
+
+# Operatör debug paneli (yalnızca TEKLIF_DEBUG_PANEL=1 iken görünür)
+record('app.rerun', time.perf_counter() - rerun_started)
+mark_first_render()
+if debug_panel_enabled():
+    DEBUG_RECENT = 5
+    with st.sidebar:
+        with st.expander("🛠️ Performans (debug)"):
+            startup_seconds = first_render_seconds()
+            if startup_seconds is not None:
+                st.write(f"**Süreç başlangıcından ilk sayfaya:** {startup_seconds:.2f} sn")
+            jobs = get_pdf_jobs().stats()
+            st.write(
+                f"**PDF işçileri:** {jobs['workers']} ({jobs['kind']}), "
+                f"kuyrukta {jobs['in_flight']}/{jobs['max_pending']}, "
+                f"tamamlanan {jobs['completed']}, reddedilen {jobs['rejected']}"
+            )
+            st.dataframe(
+                [
+                    {
+                        'Aşama': stage,
+                        'Adet': stats['count'],
+                        'p50 (ms)': stats['p50_ms'],
+                        'p95 (ms)': stats['p95_ms'],
+                        f'Son {DEBUG_RECENT} (ms)': ', '.join(f"{v:.1f}" for v in recent(stage, DEBUG_RECENT)),
+                    }
+                    for stage, stats in summary().items()
+                ],
+                hide_index=True,
+            )
+            footprint = session_footprint(st.session_state)
+            st.write(f"**Oturum belleği:** {sum(footprint.values()) / 1024:.1f} KB")
+            st.dataframe(
+                [{'Anahtar': key, 'KB': round(size / 1024, 1)} for key, size in footprint.items()],
+                hide_index=True,
+            )
+
 
 
 
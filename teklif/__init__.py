@@ -0,0 +1,5 @@
+"""Buldumlar fiyat teklifi yardımcı modülleri."""
+import os
+
+# fiyat-uygulamasi.py'nin bulunduğu klasör (fontlar, logo ve yerel veritabanları)
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
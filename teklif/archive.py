@@ -0,0 +1,257 @@
+"""Verilen tekliflerin kalıcı, yalnızca eklemeli arşivi (SQLite).
+
+Her teklif girdileriyle (müşteri, ürünler, tarih, çıktı seçenekleri) saklanır;
+PDF baytları ve SHA-256 özeti ayrı tabloya yazılır. Teklif numarası
+``BLD-YYYYmmdd-NNNNNN`` biçimindedir; sıra numarası AUTOINCREMENT anahtardan
+gelir, bu yüzden aynı dakikada verilen iki teklif bile çakışmaz ve numaralar
+asla tekrar kullanılmaz. PDF'i üretilemeyen teklifler silinemediği için
+``mark_failed`` ile ayrı tabloya işaretlenir ve aramada gösterilmez.
+
+Müşteri ve ürün adları katalogdaki gibi Türkçe katlanmış anahtarlarla
+indekslenir; "Saloon Burger'a gönderilen, Pul Biber içeren teklifler" sorgusu
+iki indeks aralığı üzerinden çalışır ve arşiv büyüse de milisaniyeler sürer.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+
+from teklif import APP_DIR
+from teklif.catalog import turkish_fold
+from teklif.db import KEY_MAX, SqliteDatabase
+from teklif.products import make_product
+
+ARCHIVE_PATH_ENV = 'TEKLIF_ARCHIVE_DB'
+# '0' ise PDF baytları saklanmaz (yalnızca SHA-256); PDF gerektiğinde yeniden üretilir
+ARCHIVE_KEEP_PDF_ENV = 'TEKLIF_ARCHIVE_KEEP_PDF'
+DEFAULT_ARCHIVE_PATH = os.path.join(APP_DIR, 'teklif_arsivi.db')
+
+QUOTE_PREFIX = 'BLD'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    quote_no     TEXT NOT NULL UNIQUE,
+    issued_at    TEXT NOT NULL,
+    customer     TEXT NOT NULL,
+    customer_key TEXT NOT NULL,
+    contact      TEXT NOT NULL,
+    options      TEXT NOT NULL,
+    item_count   INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS quotes_customer ON quotes (customer_key, issued_at);
+CREATE INDEX IF NOT EXISTS quotes_issued ON quotes (issued_at);
+
+CREATE TABLE IF NOT EXISTS quote_items (
+    quote_id   INTEGER NOT NULL REFERENCES quotes (id),
+    position   INTEGER NOT NULL,
+    name       TEXT NOT NULL,
+    name_key   TEXT NOT NULL,
+    unit_price REAL NOT NULL,
+    vat_rate   REAL NOT NULL,
+    package_kg REAL NOT NULL,
+    PRIMARY KEY (quote_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS quote_items_product ON quote_items (name_key, quote_id);
+
+CREATE TABLE IF NOT EXISTS quote_pdfs (
+    quote_id INTEGER PRIMARY KEY REFERENCES quotes (id),
+    sha256   TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    pdf      BLOB
+);
+
+-- PDF'i üretilemeyen teklifler; aramada gizlenir
+CREATE TABLE IF NOT EXISTS quote_failures (
+    quote_id  INTEGER PRIMARY KEY REFERENCES quotes (id),
+    failed_at TEXT NOT NULL,
+    reason    TEXT NOT NULL
+);
+"""
+
+# Arşiv yalnızca eklemelidir: güncelleme ve silme veritabanı seviyesinde reddedilir
+_APPEND_ONLY = """
+CREATE TRIGGER IF NOT EXISTS {table}_no_update BEFORE UPDATE ON {table}
+BEGIN SELECT RAISE(ABORT, 'teklif arşivi yalnızca eklemelidir'); END;
+CREATE TRIGGER IF NOT EXISTS {table}_no_delete BEFORE DELETE ON {table}
+BEGIN SELECT RAISE(ABORT, 'teklif arşivi yalnızca eklemelidir'); END;
+"""
+
+_QUOTE_COLUMNS = (
+    'q.quote_no, q.issued_at, q.customer, q.contact, q.item_count, p.size, '
+    'p.pdf IS NOT NULL AS stored'
+)
+
+
+def archive_path():
+    return os.environ.get(ARCHIVE_PATH_ENV) or DEFAULT_ARCHIVE_PATH
+
+
+def format_quote_number(quote_id, issued_at):
+    return f"{QUOTE_PREFIX}-{issued_at.strftime('%Y%m%d')}-{quote_id:06d}"
+
+
+class QuoteArchive(SqliteDatabase):
+    """Thread'ler arasında paylaşılabilen tek bağlantılı teklif arşivi."""
+
+    def __init__(self, path=None, keep_pdf=None):
+        super().__init__(path or archive_path())
+        if keep_pdf is None:
+            keep_pdf = os.environ.get(ARCHIVE_KEEP_PDF_ENV, '1') != '0'
+        self.keep_pdf = keep_pdf
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            for table in ('quotes', 'quote_items', 'quote_pdfs', 'quote_failures'):
+                self._conn.executescript(_APPEND_ONLY.format(table=table))
+
+    def issue(self, customer_company, contact_person, products, issued_at=None, options=None):
+        """Teklifi girdileriyle kaydeder ve yeni, benzersiz teklif numarasını döner.
+
+        PDF henüz üretilmemiştir; üretildikten sonra ``attach_pdf`` ile eklenir.
+        """
+        issued_at = issued_at or datetime.now()
+        customer_company = customer_company.strip()
+        with self._lock, self._conn:
+            # Yazma kilidi numara ayrılmadan alınır: başka süreç (ör. toplu üretim)
+            # aynı dosyaya yazıyor olsa bile iki teklif aynı numarayı alamaz
+            self._conn.execute('BEGIN IMMEDIATE')
+            row = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'quotes'").fetchone()
+            quote_id = (row[0] if row else 0) + 1
+            quote_no = format_quote_number(quote_id, issued_at)
+            self._conn.execute(
+                'INSERT INTO quotes (id, quote_no, issued_at, customer, customer_key, contact, options, item_count) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    quote_id,
+                    quote_no,
+                    issued_at.isoformat(timespec='seconds'),
+                    customer_company,
+                    turkish_fold(customer_company),
+                    (contact_person or '').strip(),
+                    json.dumps(options or {}, sort_keys=True),
+                    len(products),
+                ),
+            )
+            self._conn.executemany(
+                'INSERT INTO quote_items (quote_id, position, name, name_key, unit_price, vat_rate, package_kg) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (quote_id, position, p['name'], turkish_fold(p['name']), float(p['unit_price']),
+                     float(p['vat_rate']), float(p.get('package_kg') or 0.0))
+                    for position, p in enumerate(products)
+                ],
+            )
+        return quote_no
+
+    def attach_pdf(self, quote_no, pdf_bytes):
+        """Üretilen PDF'in özetini (``keep_pdf`` ise baytlarını da) teklife ekler."""
+        quote_id = self._quote_id(quote_no)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT INTO quote_pdfs (quote_id, sha256, size, pdf) VALUES (?, ?, ?, ?)',
+                (quote_id, hashlib.sha256(pdf_bytes).hexdigest(), len(pdf_bytes),
+                 pdf_bytes if self.keep_pdf else None),
+            )
+
+    def mark_failed(self, quote_no, reason):
+        """PDF'i üretilemeyen teklifi işaretler; numara tekrar kullanılmaz, ``find`` onu göstermez."""
+        quote_id = self._quote_id(quote_no)
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR IGNORE INTO quote_failures (quote_id, failed_at, reason) VALUES (?, ?, ?)',
+                (quote_id, datetime.now().isoformat(timespec='seconds'), reason or 'bilinmeyen hata'),
+            )
+
+    def _quote_id(self, quote_no):
+        rows = self._query('SELECT id FROM quotes WHERE quote_no = ?', (quote_no,))
+        if not rows:
+            raise KeyError(quote_no)
+        return rows[0]['id']
+
+    def get(self, quote_no):
+        """Teklifin girdileri: müşteri, tarih, seçenekler ve ürün listesi; yoksa None."""
+        rows = self._query(
+            'SELECT id, quote_no, issued_at, customer, contact, options, item_count FROM quotes '
+            'WHERE quote_no = ?',
+            (quote_no,),
+        )
+        if not rows:
+            return None
+        quote = rows[0]
+        items = self._query(
+            'SELECT name, unit_price, vat_rate, package_kg FROM quote_items '
+            'WHERE quote_id = ? ORDER BY position',
+            (quote.pop('id'),),
+        )
+        quote['issued_at'] = datetime.fromisoformat(quote['issued_at'])
+        quote['options'] = json.loads(quote['options'])
+        quote['products'] = [
+            make_product(item['name'], item['unit_price'], item['vat_rate'], item['package_kg'])
+            for item in items
+        ]
+        return quote
+
+    def pdf(self, quote_no):
+        """Arşivlenmiş PDF baytları; saklanmamışsa None."""
+        rows = self._query(
+            'SELECT p.pdf FROM quote_pdfs p JOIN quotes q ON q.id = p.quote_id WHERE q.quote_no = ?',
+            (quote_no,),
+        )
+        return rows[0]['pdf'] if rows else None
+
+    def rerender(self, quote_no, renderer=None):
+        """Arşivdeki girdilerden teklifi aynı numara ve tarihle yeniden üretir."""
+        quote = self.get(quote_no)
+        if quote is None:
+            raise KeyError(quote_no)
+        if renderer is None:
+            from teklif.render import QuoteRenderer
+            renderer = QuoteRenderer(**quote['options'])
+        return renderer.render(
+            quote['customer'],
+            quote['contact'],
+            quote['products'],
+            issued_at=quote['issued_at'],
+            quote_no=quote['quote_no'],
+        )
+
+    def find(self, customer=None, product=None, since=None, until=None, limit=100,
+             include_failed=False):
+        """Müşteri ve/veya ürün adı önekine ve tarih aralığına göre teklifler (yeniden eskiye).
+
+        ``since``/``until`` tarih (date) ya da datetime olabilir; ``until`` dahildir.
+        PDF'i üretilemeyen teklifler ``include_failed`` verilmedikçe listelenmez.
+        """
+        conditions = []
+        if not include_failed:
+            conditions.append('q.id NOT IN (SELECT quote_id FROM quote_failures)')
+        params = []
+        customer_key = turkish_fold(customer or '')
+        if customer_key:
+            conditions.append('q.customer_key >= ? AND q.customer_key < ?')
+            params += [customer_key, customer_key + KEY_MAX]
+        product_key = turkish_fold(product or '')
+        if product_key:
+            conditions.append(
+                'q.id IN (SELECT quote_id FROM quote_items WHERE name_key >= ? AND name_key < ?)'
+            )
+            params += [product_key, product_key + KEY_MAX]
+        if since is not None:
+            conditions.append('q.issued_at >= ?')
+            params.append(since.isoformat())
+        if until is not None:
+            if not isinstance(until, datetime):
+                until = datetime.combine(until, datetime.min.time()) + timedelta(days=1)
+                conditions.append('q.issued_at < ?')
+            else:
+                conditions.append('q.issued_at <= ?')
+            params.append(until.isoformat(timespec='seconds'))
+
+        sql = f'SELECT {_QUOTE_COLUMNS} FROM quotes q LEFT JOIN quote_pdfs p ON p.quote_id = q.id'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        return self._query(sql + ' ORDER BY q.id DESC LIMIT ?', params + [limit])
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM quotes').fetchone()[0]
@@ -0,0 +1,239 @@
+"""Toplu teklif üretimi: her müşteri için aynı fiyat listesinden bir PDF.
+
+Kullanım::
+
+    python -m teklif.batch musteriler.csv urunler.csv -o teklifler/
+    python -m teklif.batch musteriler.csv urunler.csv -o teklifler.zip -j 8
+    python -m teklif.batch musteriler.csv urunler.csv -o teklifler.zip --archive
+
+Müşteri CSV'si ``customer_company`` ve (opsiyonel) ``contact_person``
+kolonlarını, ürün CSV'si ``name``, ``unit_price``, ``vat_rate`` ve
+(opsiyonel) ``package_kg`` kolonlarını içermelidir; kurallara uymayan ürün
+satırları içe aktarmadaki gibi raporlanıp atlanır. ``--archive`` ile her
+teklif arşive yazılır ve arşivden benzersiz bir teklif numarası alır.
+"""
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+from teklif.importer import MAX_REPORTED_ERRORS, RowError, parse_row
+from teklif.products import make_product
+
+# Her işçi süreçte bir kez kurulan durum (font kaydı, stiller, filigran)
+_worker_renderer = None
+_worker_products = None
+_worker_issued_at = None
+
+_TR_ASCII = str.maketrans('çğıöşüÇĞİÖŞÜ', 'cgiosuCGIOSU')
+
+
+def read_customers(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            company = (row.get('customer_company') or '').strip()
+            if company:
+                yield company, (row.get('contact_person') or '').strip()
+
+
+def read_products(path):
+    """Ürün CSV'sini içe aktarmadaki kurallarla okur; (ürünler, hatalı satırlar) döner.
+
+    Kurallara uymayan satırlar (negatif fiyat, 0-100 dışı KDV vb.) atlanır.
+    """
+    products = []
+    errors = []
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            if not (row.get('name') or '').strip():
+                continue
+            try:
+                products.append(make_product(**parse_row(row)))
+            except ValueError as e:
+                errors.append(RowError(line_no, str(e)))
+    return products, errors
+
+
+def quote_file_name(index, customer_company):
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', customer_company.translate(_TR_ASCII)).strip('_')
+    return f"{index:04d}_{slug or 'musteri'}.pdf"
+
+
+def init_worker(products, issued_at, renderer_options):
+    global _worker_renderer, _worker_products, _worker_issued_at
+    from teklif.render import QuoteRenderer
+    from teklif.watermark import get_watermark
+
+    _worker_renderer = QuoteRenderer(**renderer_options)
+    _worker_products = products
+    _worker_issued_at = issued_at
+    # Filigranı ilk tekliften önce ısıt
+    if _worker_renderer.use_watermark:
+        get_watermark(_worker_renderer.logo_file, compact=_worker_renderer.compact)
+
+
+def render_for_customer(index, customer_company, contact_person, quote_no=None):
+    pdf_bytes = _worker_renderer.render(
+        customer_company, contact_person, _worker_products, issued_at=_worker_issued_at,
+        quote_no=quote_no,
+    )
+    return index, customer_company, quote_no, pdf_bytes
+
+
+class _DirectoryWriter:
+    def __init__(self, path):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+
+    def write(self, name, data):
+        with open(os.path.join(self.path, name), 'wb') as f:
+            f.write(data)
+
+    def close(self):
+        pass
+
+
+class _ZipWriter:
+    def __init__(self, path):
+        # PDF'ler zaten sıkıştırılmış; tekrar sıkıştırmak zaman kaybı
+        self.zip = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED)
+
+    def write(self, name, data):
+        self.zip.writestr(name, data)
+
+    def close(self):
+        self.zip.close()
+
+
+def open_output(path):
+    if path.lower().endswith('.zip'):
+        return _ZipWriter(path)
+    return _DirectoryWriter(path)
+
+
+def run_batch(customers, products, output, jobs=None, issued_at=None, renderer_options=None,
+              progress=None, archive=None):
+    """Teklifleri süreç havuzunda üretip ``output``'a akıtır; (adet, süre, toplam bayt) döner.
+
+    ``archive`` (QuoteArchive) verilirse numaralar ana süreçte ayrılır, PDF'ler arşive eklenir.
+    Bir işçi hata verirse üretim durur; PDF'i yazılamamış numaralar başarısız işaretlenir.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    issued_at = issued_at or datetime.now()
+    renderer_options = renderer_options or {}
+    max_in_flight = jobs * 4
+
+    writer = open_output(output)
+    count = 0
+    total_bytes = 0
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=init_worker,
+            initargs=(products, issued_at, renderer_options),
+        ) as pool:
+            pending = set()
+            # Arşive yazılmış ama PDF'i henüz eklenmemiş numaralar
+            unfinished = set()
+            customer_iter = enumerate(customers, start=1)
+            exhausted = False
+            try:
+                while True:
+                    # Bellekte en fazla max_in_flight PDF bekler
+                    while not exhausted and len(pending) < max_in_flight:
+                        try:
+                            index, (company, contact) = next(customer_iter)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        quote_no = None
+                        if archive is not None:
+                            quote_no = archive.issue(company, contact, products, issued_at, renderer_options)
+                            unfinished.add(quote_no)
+                        pending.add(pool.submit(render_for_customer, index, company, contact, quote_no))
+                    if not pending:
+                        break
+
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, company, quote_no, pdf_bytes = future.result()
+                        writer.write(quote_file_name(index, company), pdf_bytes)
+                        if archive is not None:
+                            archive.attach_pdf(quote_no, pdf_bytes)
+                            unfinished.discard(quote_no)
+                        count += 1
+                        total_bytes += len(pdf_bytes)
+                        if progress:
+                            progress(count)
+            except BaseException as e:
+                for future in pending:
+                    future.cancel()
+                for quote_no in unfinished:
+                    archive.mark_failed(quote_no, f"Toplu üretim durdu: {e!r}")
+                raise
+    finally:
+        writer.close()
+
+    return count, time.perf_counter() - started, total_bytes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m teklif.batch',
+        description='Müşteri listesindeki her firma için fiyat teklifi PDF\'i üretir.',
+    )
+    parser.add_argument('customers', help="Müşteri CSV'si (customer_company, contact_person)")
+    parser.add_argument('products', help="Ürün CSV'si (name, unit_price, vat_rate, package_kg)")
+    parser.add_argument('-o', '--output', required=True,
+                        help='Çıktı klasörü veya .zip dosyası')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='İşçi süreç sayısı (varsayılan: CPU sayısı)')
+    parser.add_argument('--logo', default=None, help='Filigran logosu (varsayılan: logo.png vb.)')
+    parser.add_argument('--no-logo', action='store_true', help='Filigransız üret')
+    parser.add_argument('--compact', action='store_true',
+                        help='E-posta/WhatsApp için küçük dosya (küçültülmüş filigran)')
+    parser.add_argument('--archive', action='store_true',
+                        help='Teklifleri arşive kaydet (TEKLIF_ARCHIVE_DB, varsayılan teklif_arsivi.db)')
+    args = parser.parse_args(argv)
+
+    products, errors = read_products(args.products)
+    for error in errors[:MAX_REPORTED_ERRORS]:
+        print(f"{args.products}:{error.line}: {error.message} (satır atlandı)", file=sys.stderr)
+    if len(errors) > MAX_REPORTED_ERRORS:
+        print(f"... ve {len(errors) - MAX_REPORTED_ERRORS} hatalı satır daha", file=sys.stderr)
+    if not products:
+        parser.error(f"{args.products}: ürün bulunamadı")
+
+    renderer_options = {'logo_file': args.logo, 'watermark': not args.no_logo, 'compact': args.compact}
+    archive = None
+    if args.archive:
+        from teklif.archive import QuoteArchive
+        archive = QuoteArchive()
+    try:
+        count, elapsed, total_bytes = run_batch(
+            read_customers(args.customers),
+            products,
+            args.output,
+            jobs=args.jobs,
+            renderer_options=renderer_options,
+            archive=archive,
+        )
+    finally:
+        if archive is not None:
+            archive.close()
+
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"{count} teklif {elapsed:.2f} sn'de üretildi ({rate:.1f} teklif/sn) -> {args.output}")
+    if count:
+        print(f"Toplam {total_bytes / 1024:.1f} KB, teklif başına ortalama {total_bytes / count / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Kalıcı ürün kataloğu (SQLite).
+
+Ürünler Türkçe büyük/küçük harf katlamasıyla (İ/i, I/ı) normalize edilmiş ad
+anahtarına göre saklanır. Önek araması birincil anahtar indeksindeki bir
+aralık sorgusudur; katalog büyüse de yalnızca eşleşen ilk birkaç satır okunur.
+"""
+import os
+from datetime import datetime
+
+from teklif import APP_DIR
+from teklif.db import KEY_MAX, SqliteDatabase
+
+CATALOG_PATH_ENV = 'TEKLIF_CATALOG_DB'
+DEFAULT_CATALOG_PATH = os.path.join(APP_DIR, 'katalog.db')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    name_key   TEXT PRIMARY KEY,
+    name       TEXT NOT NULL,
+    unit_price REAL NOT NULL,
+    vat_rate   REAL NOT NULL,
+    package_kg REAL NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+) WITHOUT ROWID
+"""
+
+_COLUMNS = ('name', 'unit_price', 'vat_rate', 'package_kg')
+
+
+def turkish_fold(text):
+    """Türkçe kurallarıyla küçük harfe çevirir ve boşlukları sadeleştirir."""
+    text = text.replace('İ', 'i').replace('I', 'ı').lower()
+    return ' '.join(text.split())
+
+
+def catalog_path():
+    return os.environ.get(CATALOG_PATH_ENV) or DEFAULT_CATALOG_PATH
+
+
+class Catalog(SqliteDatabase):
+    """Thread'ler arasında paylaşılabilen tek bağlantılı katalog."""
+
+    def __init__(self, path=None):
+        super().__init__(path or catalog_path())
+        with self._conn:
+            self._conn.execute(_SCHEMA)
+
+    def search(self, prefix, limit=10):
+        """Adı ``prefix`` ile başlayan ürünleri alfabetik sırayla döner."""
+        key = turkish_fold(prefix)
+        if not key:
+            return []
+        return self._query(
+            'SELECT name, unit_price, vat_rate, package_kg FROM products '
+            'WHERE name_key >= ? AND name_key < ? ORDER BY name_key LIMIT ?',
+            (key, key + KEY_MAX, limit),
+        )
+
+    def get(self, name):
+        rows = self._query(
+            'SELECT name, unit_price, vat_rate, package_kg FROM products WHERE name_key = ?',
+            (turkish_fold(name),),
+        )
+        return rows[0] if rows else None
+
+    def products(self, name_contains=None):
+        """Tüm ürünler ya da adında ``name_contains`` geçenler (toplu fiyat güncellemesi için)."""
+        sql = 'SELECT name, unit_price, vat_rate, package_kg FROM products'
+        params = ()
+        needle = turkish_fold(name_contains or '')
+        if needle:
+            sql += " WHERE instr(name_key, ?) > 0"
+            params = (needle,)
+        return self._query(sql + ' ORDER BY name_key', params)
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM products').fetchone()[0]
+
+    def upsert_many(self, products):
+        """Ürünleri ekler ya da aynı adlı kaydı günceller; yazılan satır sayısını döner."""
+        now = datetime.now().isoformat(timespec='seconds')
+        rows = [
+            (turkish_fold(p['name']), p['name'].strip(), float(p['unit_price']),
+             float(p['vat_rate']), float(p.get('package_kg') or 0.0), now)
+            for p in products
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT INTO products (name_key, name, unit_price, vat_rate, package_kg, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(name_key) DO UPDATE SET name = excluded.name, '
+                'unit_price = excluded.unit_price, vat_rate = excluded.vat_rate, '
+                'package_kg = excluded.package_kg, updated_at = excluded.updated_at',
+                rows,
+            )
+        return len(rows)
+
+    def upsert(self, product):
+        self.upsert_many([product])
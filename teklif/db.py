@@ -0,0 +1,26 @@
+"""Katalog ve teklif arşivinin ortak SQLite yardımcıları."""
+import sqlite3
+import threading
+
+# Aralık sorgusunun üst sınırı: her anahtardan büyük son kod noktası
+KEY_MAX = '\U0010ffff'
+
+
+class SqliteDatabase:
+    """Thread'ler arasında paylaşılabilen tek bağlantılı SQLite veritabanı (WAL)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
@@ -0,0 +1,182 @@
+"""Aşama süreleri ve oturum bellek ölçümleri.
+
+Kod parçaları ``with span('pdf.build'):`` ile sarılır; her ölçüm süreç
+genelindeki kayıt defterine (aşama başına son ``HISTORY_SIZE`` değer) eklenir
+ve ``teklif.timing`` logger'ına tek satırlık JSON olarak yazılır. Her
+``SUMMARY_EVERY`` ölçümde bir p50/p95 özeti de loglanır.
+
+JSON logları ``TEKLIF_TIMING_LOG=1`` ile stderr'e açılır; Streamlit'teki
+debug paneli ``TEKLIF_DEBUG_PANEL=1`` ile görünür olur.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+TIMING_LOG_ENV = 'TEKLIF_TIMING_LOG'
+DEBUG_PANEL_ENV = 'TEKLIF_DEBUG_PANEL'
+
+HISTORY_SIZE = 200
+SUMMARY_EVERY = 100
+
+logger = logging.getLogger('teklif.timing')
+
+_lock = threading.Lock()
+_history = defaultdict(lambda: deque(maxlen=HISTORY_SIZE))
+_counts = defaultdict(int)
+_recorded = 0
+
+# Süreç başlangıcı bilinemezse en azından bu modülün yüklendiği an kullanılır
+_module_loaded_at = time.time()
+_first_render = None
+
+
+def _env_flag(name):
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def debug_panel_enabled():
+    return _env_flag(DEBUG_PANEL_ENV)
+
+
+def configure_logging(stream=None):
+    """``TEKLIF_TIMING_LOG`` açıksa JSON satırlarını ``stream``'e (stderr) yazar."""
+    if not _env_flag(TIMING_LOG_ENV) or logger.handlers:
+        return
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def record(stage, seconds, **fields):
+    global _recorded
+    with _lock:
+        _history[stage].append(seconds)
+        _counts[stage] += 1
+        _recorded += 1
+        emit_summary = _recorded % SUMMARY_EVERY == 0
+
+    if logger.isEnabledFor(logging.INFO):
+        entry = {'event': 'span', 'stage': stage, 'ms': round(seconds * 1000, 3)}
+        entry.update(fields)
+        logger.info(json.dumps(entry, ensure_ascii=False))
+        if emit_summary:
+            logger.info(json.dumps({'event': 'summary', 'stages': summary()}, ensure_ascii=False))
+
+
+@contextmanager
+def span(stage, **fields):
+    """Bloğun süresini ``stage`` adıyla kaydeder (hata olsa bile)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started, **fields)
+
+
+def process_started_at():
+    """Sürecin (ör. konteynerdeki Streamlit sunucusunun) başladığı an, epoch saniyesi."""
+    try:
+        import psutil
+        return psutil.Process().create_time()
+    except Exception:
+        pass
+    try:
+        # Linux: /proc/self/stat 22. alan, açılıştan beri saat tıkı cinsinden
+        with open('/proc/self/stat') as f:
+            start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/stat') as f:
+            boot_time = next(int(line.split()[1]) for line in f if line.startswith('btime'))
+        return boot_time + start_ticks / os.sysconf('SC_CLK_TCK')
+    except Exception:
+        return _module_loaded_at
+
+
+def mark_first_render():
+    """Süreçteki ilk sayfa çiziminin sonunda çağrılır; sonraki çağrılar etkisizdir."""
+    global _first_render
+    if _first_render is not None:
+        return
+    _first_render = max(0.0, time.time() - process_started_at())
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({'event': 'first_render', 'seconds': round(_first_render, 3)}))
+
+
+def first_render_seconds():
+    return _first_render
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summary():
+    """Aşama başına toplam sayı, son değer ve son ölçümler üzerinden p50/p95 (ms)."""
+    with _lock:
+        snapshot = {stage: (list(values), _counts[stage]) for stage, values in _history.items()}
+
+    result = {}
+    for stage, (values, count) in sorted(snapshot.items()):
+        ordered = sorted(values)
+        result[stage] = {
+            'count': count,
+            'last_ms': round(values[-1] * 1000, 3),
+            'p50_ms': round(_percentile(ordered, 0.50) * 1000, 3),
+            'p95_ms': round(_percentile(ordered, 0.95) * 1000, 3),
+        }
+    return result
+
+
+def recent(stage, limit=10):
+    """``stage`` için en yeni ``limit`` ölçüm (ms), en yenisi önce."""
+    with _lock:
+        values = list(_history.get(stage, ()))
+    return [round(v * 1000, 3) for v in reversed(values[-limit:])]
+
+
+def reset():
+    global _recorded
+    with _lock:
+        _history.clear()
+        _counts.clear()
+        _recorded = 0
+
+
+def deep_sizeof(obj, _seen=None):
+    """Nesnenin ve içerdiği liste/sözlük/tuple öğelerinin yaklaşık bayt boyutu."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, _seen) + deep_sizeof(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_sizeof(item, _seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += deep_sizeof(vars(obj), _seen)
+    else:
+        # __slots__ kullanan kayıtlar (ör. Product)
+        for slot in getattr(type(obj), '__slots__', ()):
+            size += deep_sizeof(getattr(obj, slot, None), _seen)
+    return size
+
+
+def session_footprint(state):
+    """Oturum durumundaki her anahtarın yaklaşık bellek kullanımı (bayt), büyükten küçüğe."""
+    sizes = {}
+    for key in list(state.keys()):
+        try:
+            sizes[str(key)] = deep_sizeof(state[key])
+        except Exception:
+            continue
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
@@ -0,0 +1,94 @@
+"""Türkçe karakterler için DejaVu font kaydı.
+
+Fontlar süreç başına bir kez aranır, ayrıştırılır ve kaydedilir; sonraki
+``setup_fonts()`` çağrıları (ör. her Streamlit rerun'ı) yalnızca önbellekteki
+sonucu döner. Arama sırası:
+
+1. ``TEKLIF_FONT_DIRS`` ortam değişkenindeki klasörler (``os.pathsep`` ile ayrılmış)
+2. Uygulama klasörü
+3. Uygulama klasöründeki ``fonts/``
+4. Sistemdeki DejaVu klasörleri
+"""
+import os
+import threading
+from collections import namedtuple
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from teklif import APP_DIR
+
+FONT_DIRS_ENV = 'TEKLIF_FONT_DIRS'
+
+SYSTEM_FONT_DIRS = [
+    '/usr/share/fonts/truetype/dejavu',
+    '/usr/share/fonts/TTF',
+    '/usr/share/fonts/dejavu',
+]
+
+NORMAL_FONT = ('DejaVuSans', 'DejaVuSans.ttf')
+BOLD_FONT = ('DejaVuSans-Bold', 'DejaVuSans-Bold.ttf')
+
+FontSetup = namedtuple('FontSetup', ['normal', 'bold', 'error'])
+
+_lock = threading.Lock()
+_setup = None
+
+
+def font_search_paths():
+    paths = [p for p in os.environ.get(FONT_DIRS_ENV, '').split(os.pathsep) if p]
+    paths.append(APP_DIR)
+    paths.append(os.path.join(APP_DIR, 'fonts'))
+    paths.extend(SYSTEM_FONT_DIRS)
+    return paths
+
+
+def find_font_file(filename, search_paths=None):
+    for directory in search_paths or font_search_paths():
+        path = os.path.join(directory, filename)
+        if os.path.isfile(path):
+            return path
+    raise FileNotFoundError(f"{filename} bulunamadı")
+
+
+def register_font(name, path):
+    """TTF dosyasını ayrıştırıp kaydeder; aynı isim zaten kayıtlıysa dokunmaz."""
+    if name not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont(name, path))
+
+
+def _load_fonts(search_paths):
+    try:
+        for name, filename in (NORMAL_FONT, BOLD_FONT):
+            register_font(name, find_font_file(filename, search_paths))
+
+        return FontSetup(NORMAL_FONT[0], BOLD_FONT[0], None)
+
+    except Exception as e:
+        # Font yüklenemezse hata döner ama yine de PDF oluşsun
+        return FontSetup("Helvetica", "Helvetica-Bold", e)
+
+
+def setup_fonts(search_paths=None):
+    """DejaVu fontlarını süreç başına bir kez kaydeder; Helvetica'ya düşerse hatayı döner.
+
+    ``search_paths`` yalnızca ilk çağrıda dikkate alınır.
+    """
+    global _setup
+    if _setup is None:
+        with _lock:
+            if _setup is None:
+                _setup = _load_fonts(search_paths)
+    return _setup
+
+
+def turkish_fonts_loaded():
+    """Türkçe glifleri içeren fontlar kayıtlıysa True."""
+    return setup_fonts().error is None
+
+
+def reset_fonts():
+    """Önbelleği unutur; bir sonraki setup_fonts() yeniden arar (kayıtlı fontlar kalır)."""
+    global _setup
+    with _lock:
+        _setup = None
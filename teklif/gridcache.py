@@ -0,0 +1,74 @@
+"""Büyük ürün listelerinin tablo (DataFrame) halleri için paylaşılan önbellek.
+
+Tablo her rerun'da yeniden kurulmasın diye saklanır, ama oturum durumunda
+değil: tüm oturumlar tek, bayt bütçeli bir LRU önbelleği paylaşır. Her oturumun
+yalnızca son tablosu tutulur; toplam boyut ``max_bytes``'ı aşınca en uzun
+süredir kullanılmayan oturumun tablosu atılır (gerekirse yeniden kurulur).
+"""
+import os
+import threading
+from collections import OrderedDict
+
+GRID_CACHE_MB_ENV = 'TEKLIF_GRID_CACHE_MB'
+DEFAULT_GRID_CACHE_MB = 32
+
+
+class GridCache:
+    """Oturum başına bir tablo tutan, thread güvenli, bayt bütçeli LRU önbellek."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        # oturum -> (sürüm, tablo, bayt); en uzun süredir kullanılmayan başta
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, session_id, version):
+        """Oturumun ``version`` için kurulmuş tablosu; yoksa ya da eskiyse None."""
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(session_id)
+            return entry[1]
+
+    def put(self, session_id, version, frame):
+        size = int(frame.memory_usage(deep=True).sum())
+        with self._lock:
+            self._pop(session_id)
+            if size > self.max_bytes:
+                return
+            self._entries[session_id] = (version, frame, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def discard(self, session_id):
+        with self._lock:
+            self._pop(session_id)
+
+    def _pop(self, session_id):
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def session_bytes(self, session_id):
+        with self._lock:
+            entry = self._entries.get(session_id)
+            return entry[2] if entry else 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+            }
+
+
+def grid_cache_from_env():
+    megabytes = float(os.environ.get(GRID_CACHE_MB_ENV) or DEFAULT_GRID_CACHE_MB)
+    return GridCache(int(megabytes * 1024 * 1024))
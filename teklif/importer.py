@@ -0,0 +1,152 @@
+"""CSV/XLSX fiyat listelerinin parça parça içe aktarılması.
+
+Dosya tek seferde DataFrame'e okunmaz: satırlar akış halinde okunur,
+``chunk_size`` satırlık parçalar halinde doğrulanıp kompakt ürün kayıtlarına
+(``Product``) çevrilir ve ``sink``'e (ör. ``Catalog.upsert_many``) yazılır.
+Bellekte aynı anda yalnızca bir parça ve en fazla ``MAX_REPORTED_ERRORS`` hata
+tutulur.
+"""
+import codecs
+import csv
+from collections import namedtuple
+
+from teklif.catalog import turkish_fold
+from teklif.products import Product, parse_number, validate_product
+
+DEFAULT_CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 1000
+
+# Başlık satırında kabul edilen kolon adları (Türkçe katlanmış)
+COLUMN_ALIASES = {
+    'name': ['name', 'ürün adı', 'ürün', 'urun adi', 'urun'],
+    'unit_price': ['unit_price', 'kg fiyatı', 'kilogram fiyatı', 'fiyat', 'kg fiyatı kdv hariç',
+                   'kg fiyatı kdv hariç (tl)'],
+    'vat_rate': ['vat_rate', 'kdv', 'kdv %', 'kdv (%)'],
+    'package_kg': ['package_kg', 'ambalaj', 'ambalaj (kg)', 'ambalaj kg'],
+}
+
+RowError = namedtuple('RowError', ['line', 'message'])
+ImportResult = namedtuple('ImportResult', ['imported', 'error_count', 'errors'])
+
+
+def _column_map(header):
+    """Başlık hücrelerini iç kolon adlarına eşler: {iç ad: kolon sırası}."""
+    folded = [turkish_fold(str(cell or '')) for cell in header]
+    mapping = {}
+    for column, aliases in COLUMN_ALIASES.items():
+        for position, cell in enumerate(folded):
+            if cell in aliases:
+                mapping[column] = position
+                break
+    if 'name' not in mapping or 'unit_price' not in mapping:
+        raise ValueError("Başlık satırında ürün adı ve fiyat kolonları bulunamadı")
+    return mapping
+
+
+def _iter_csv_rows(fileobj):
+    reader = codecs.getreader('utf-8-sig')(fileobj)
+    first_line = reader.readline()
+    # Excel'in Türkçe ayarları ';' ile kaydeder
+    delimiter = ';' if first_line.count(';') > first_line.count(',') else ','
+    lines = _prepend(first_line, reader)
+    yield from csv.reader(lines, delimiter=delimiter)
+
+
+def _prepend(first, rest):
+    yield first
+    yield from rest
+
+
+def _iter_xlsx_rows(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ImportError("XLSX dosyaları için openpyxl kurulu olmalı (pip install openpyxl)") from e
+
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def iter_rows(fileobj, filename):
+    """Dosyayı (satır no, ham satır) olarak akıtır; satır no başlık dahil 1'den başlar."""
+    if filename.lower().endswith(('.xlsx', '.xlsm')):
+        rows = _iter_xlsx_rows(fileobj)
+    else:
+        rows = _iter_csv_rows(fileobj)
+
+    header = next(rows, None)
+    if header is None:
+        raise ValueError("Dosya boş")
+    mapping = _column_map(header)
+
+    for line, cells in enumerate(rows, start=2):
+        if not cells or all(cell in (None, '') for cell in cells):
+            continue
+        yield line, {
+            column: cells[position] if position < len(cells) else None
+            for column, position in mapping.items()
+        }
+
+
+def parse_row(raw):
+    """Ham satırı ürün alanlarına çevirir; kurallara uymuyorsa ValueError."""
+    name = str(raw.get('name') or '').strip()
+    try:
+        unit_price = parse_number(raw.get('unit_price'), default=None)
+        vat_rate = parse_number(raw.get('vat_rate'), default=1.0)
+        package_kg = parse_number(raw.get('package_kg'))
+    except ValueError:
+        raise ValueError("Sayısal alan okunamadı")
+    if unit_price is None:
+        raise ValueError("Kilogram fiyatı boş")
+
+    error = validate_product(name, unit_price, vat_rate, package_kg)
+    if error:
+        raise ValueError(error)
+    return {'name': name, 'unit_price': unit_price, 'vat_rate': vat_rate, 'package_kg': package_kg}
+
+
+def iter_chunks(fileobj, filename, chunk_size=DEFAULT_CHUNK_SIZE):
+    """(son satır no, fiyatları hesaplanmış ürünler, hatalar) parçaları üretir."""
+    valid = []
+    errors = []
+    line = 0
+    for line, raw in iter_rows(fileobj, filename):
+        try:
+            valid.append(parse_row(raw))
+        except ValueError as e:
+            errors.append(RowError(line, str(e)))
+
+        if len(valid) + len(errors) >= chunk_size:
+            yield line, _price_chunk(valid), errors
+            valid, errors = [], []
+
+    if valid or errors:
+        yield line, _price_chunk(valid), errors
+
+
+def _price_chunk(rows):
+    # Türetilmiş fiyatlar Product kaydında erişimde hesaplanır; burada tablo gerekmez
+    return [Product(**row) for row in rows]
+
+
+def import_price_list(fileobj, filename, sink, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Dosyayı parça parça ``sink(products)``'e yazar; ImportResult döner.
+
+    ``progress(son_satir_no, aktarilan)`` her parçadan sonra çağrılır.
+    """
+    imported = 0
+    error_count = 0
+    reported = []
+    for line, products, errors in iter_chunks(fileobj, filename, chunk_size):
+        if products:
+            sink(products)
+            imported += len(products)
+        error_count += len(errors)
+        reported.extend(errors[:MAX_REPORTED_ERRORS - len(reported)])
+        if progress:
+            progress(line, imported)
+    return ImportResult(imported, error_count, reported)
@@ -0,0 +1,162 @@
+"""Arka planda teklif üretimi için sınırlı işçi havuzu.
+
+Tüm Streamlit oturumları tek bir ``QuoteJobs`` örneğini paylaşır. En fazla
+``max_workers`` teklif aynı anda çizilir; bekleyen ve çalışan işlerin toplamı
+``max_pending``'i aşarsa yeni iş ``QueueFullError`` ile reddedilir. Böylece
+ağır bir teklif ya da aynı anda gelen çok sayıda tıklama, diğer oturumların
+betik thread'lerini kilitlemez.
+
+``TEKLIF_PDF_EXECUTOR=process`` ile işler ayrı süreçlerde çalışır (GIL'den
+bağımsız, her işçide bir kez font/filigran kurulumu); varsayılan thread'dir.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+PDF_WORKERS_ENV = 'TEKLIF_PDF_WORKERS'
+PDF_QUEUE_ENV = 'TEKLIF_PDF_QUEUE'
+PDF_EXECUTOR_ENV = 'TEKLIF_PDF_EXECUTOR'
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE = 8
+
+# İşçi (thread ya da süreç) başına bir kez kurulan renderer'lar
+_renderers = {}
+_renderers_lock = threading.Lock()
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+def _renderer(options):
+    key = tuple(sorted(options.items()))
+    renderer = _renderers.get(key)
+    if renderer is None:
+        with _renderers_lock:
+            renderer = _renderers.get(key)
+            if renderer is None:
+                from teklif.render import QuoteRenderer
+                renderer = _renderers[key] = QuoteRenderer(**options)
+    return renderer
+
+
+def render_quote_job(customer_company, contact_person, products, issued_at, renderer_options=None,
+                     quote_no=None):
+    """İşçide çalışan iş: PDF baytlarını döner."""
+    renderer = _renderer(renderer_options or {})
+    return renderer.render(customer_company, contact_person, products, issued_at=issued_at,
+                           quote_no=quote_no)
+
+
+class QuoteJobs:
+    def __init__(self, max_workers=DEFAULT_WORKERS, max_pending=DEFAULT_QUEUE, kind='thread'):
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers)
+        self.kind = kind
+        if kind == 'process':
+            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='teklif-pdf')
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def reserve(self):
+        """Kuyrukta bir yer ayırır; doluysa QueueFullError.
+
+        Ayrılan yer ``submit_reserved`` ile kullanılmalı ya da ``release`` ile bırakılmalıdır.
+        """
+        with self._lock:
+            if self._in_flight >= self.max_pending:
+                self.rejected += 1
+                raise QueueFullError(f"PDF kuyruğu dolu ({self.max_pending} iş)")
+            self._in_flight += 1
+
+    def release(self):
+        """Kullanılmayan ayrılmış yeri bırakır."""
+        self._release(None)
+
+    def submit_reserved(self, fn, *args, **kwargs):
+        """İşi önceden ayrılmış yere alır ve Future döner."""
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def submit(self, fn, *args, **kwargs):
+        """İşi kuyruğa alır ve Future döner; kuyruk doluysa QueueFullError."""
+        self.reserve()
+        return self.submit_reserved(fn, *args, **kwargs)
+
+    def _release(self, future):
+        with self._lock:
+            self._in_flight -= 1
+            if future is not None:
+                self.completed += 1
+
+    def submit_quote(self, customer_company, contact_person, products, issued_at, renderer_options=None,
+                     quote_no=None, reserved=False):
+        # İşçi kendi kopyasıyla çalışsın; oturumdaki liste bu sırada değişebilir
+        submit = self.submit_reserved if reserved else self.submit
+        return submit(
+            render_quote_job, customer_company, contact_person, list(products), issued_at,
+            renderer_options, quote_no,
+        )
+
+    def issue_quote(self, archive, customer_company, contact_person, products, issued_at,
+                    renderer_options=None):
+        """Teklifi arşive yazıp üretimini başlatır; (Future, teklif numarası) döner.
+
+        Numara ancak kuyrukta yer ayrıldıktan sonra alınır: kuyruk doluysa
+        (QueueFullError) arşive hiçbir şey yazılmaz. İş kuyruğa alınamazsa numara
+        arşivde başarısız olarak işaretlenir. ``archive`` None ise numara None'dır.
+        """
+        self.reserve()
+        quote_no = None
+        try:
+            if archive is not None:
+                quote_no = archive.issue(customer_company, contact_person, products, issued_at,
+                                         renderer_options)
+        except Exception:
+            self.release()
+            raise
+        try:
+            future = self.submit_quote(customer_company, contact_person, products, issued_at,
+                                       renderer_options, quote_no, reserved=True)
+        except Exception as e:
+            if quote_no:
+                archive.mark_failed(quote_no, str(e))
+            raise
+        return future, quote_no
+
+    def depth(self):
+        """Bekleyen + çalışan iş sayısı."""
+        with self._lock:
+            return self._in_flight
+
+    def stats(self):
+        with self._lock:
+            return {
+                'kind': self.kind,
+                'workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'in_flight': self._in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+            }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+def jobs_from_env():
+    return QuoteJobs(
+        max_workers=int(os.environ.get(PDF_WORKERS_ENV) or DEFAULT_WORKERS),
+        max_pending=int(os.environ.get(PDF_QUEUE_ENV) or DEFAULT_QUEUE),
+        kind=os.environ.get(PDF_EXECUTOR_ENV) or 'thread',
+    )
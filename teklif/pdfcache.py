@@ -0,0 +1,101 @@
+"""Üretilmiş teklif PDF'leri için içerik adresli LRU önbellek.
+
+Anahtar, teklifi belirleyen girdilerin (müşteri, ürünler, logo, font, tarih)
+normalize edilmiş halinin SHA-256 özetidir; aynı girdiler aynı PDF'i verir.
+Önbellek tüm oturumlarca paylaşılır ve toplam PDF boyutu ``max_bytes``'ı
+aşınca en uzun süredir kullanılmayan kayıtlar atılır.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+PDF_CACHE_MB_ENV = 'TEKLIF_PDF_CACHE_MB'
+DEFAULT_PDF_CACHE_MB = 64
+
+# quote_no: PDF'e basılmış arşiv numarası (arşivsiz üretildiyse None)
+CachedQuote = namedtuple('CachedQuote', ['pdf_bytes', 'issued_at', 'quote_no'], defaults=(None,))
+
+# Anahtara giren ürün alanları; fiyatlar kuruş altı gürültüden arındırılır
+_KEY_FIELDS = ('unit_price', 'vat_rate', 'vat_price', 'package_kg', 'package_price_incl_vat')
+
+
+def quote_cache_key(customer_company, contact_person, products, logo_fingerprint, fonts, date,
+                    options=None):
+    payload = {
+        'customer_company': customer_company.strip(),
+        'contact_person': (contact_person or '').strip(),
+        'products': [
+            [product['name'].strip()]
+            + [round(float(product.get(field) or 0.0), 6) for field in _KEY_FIELDS]
+            for product in products
+        ],
+        'logo': logo_fingerprint,
+        'fonts': list(fonts),
+        'date': date.isoformat(),
+        'options': options or {},
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class PdfCache:
+    """Bayt bütçeli, thread güvenli LRU önbellek."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, pdf_bytes, issued_at, quote_no=None):
+        size = len(pdf_bytes)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.pdf_bytes)
+            self._entries[key] = CachedQuote(pdf_bytes, issued_at, quote_no)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.pdf_bytes)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def cache_from_env():
+    megabytes = float(os.environ.get(PDF_CACHE_MB_ENV) or DEFAULT_PDF_CACHE_MB)
+    return PdfCache(int(megabytes * 1024 * 1024))
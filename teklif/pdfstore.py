@@ -0,0 +1,197 @@
+"""Oturumlara verilen PDF'ler için bellek bütçeli depo.
+
+Oturum durumunda PDF baytları değil, yalnızca depodaki anahtarları tutulur;
+indirme butonu baytları tıklandığında depodan okur. Bir oturumun bellekteki
+PDF'leri ``session_max_bytes``'ı, tüm oturumlarınki ``max_bytes``'ı aşınca en
+uzun süredir kullanılmayanlar diske taşınır (spill). Diskteki dosyalar da
+``spill_max_bytes`` ile sınırlıdır; bu da aşılırsa en eski PDF'ler atılır ve
+``get`` None döner (teklif arşivden ya da yeniden üretilerek alınır).
+"""
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+
+SESSION_PDF_MB_ENV = 'TEKLIF_SESSION_PDF_MB'
+PDF_MEMORY_MB_ENV = 'TEKLIF_PDF_MEMORY_MB'
+PDF_SPILL_MB_ENV = 'TEKLIF_PDF_SPILL_MB'
+PDF_SPILL_DIR_ENV = 'TEKLIF_PDF_SPILL_DIR'
+
+DEFAULT_SESSION_PDF_MB = 4
+DEFAULT_PDF_MEMORY_MB = 64
+DEFAULT_PDF_SPILL_MB = 512
+
+_MB = 1024 * 1024
+
+
+class _Entry:
+    __slots__ = ('session_id', 'size', 'data', 'path')
+
+    def __init__(self, session_id, data):
+        self.session_id = session_id
+        self.size = len(data)
+        self.data = data
+        self.path = None
+
+
+class PdfStore:
+    """Thread güvenli, oturum ve toplam bayt bütçeli PDF deposu."""
+
+    def __init__(self, max_bytes, session_max_bytes, spill_max_bytes=0, spill_dir=None):
+        self.max_bytes = max_bytes
+        self.session_max_bytes = session_max_bytes
+        self.spill_max_bytes = spill_max_bytes
+        self._spill_dir = spill_dir
+        self._own_spill_dir = False
+        # Sıra: en uzun süredir kullanılmayan başta
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_bytes = 0
+        self._spilled_bytes = 0
+        self.spills = 0
+        self.evictions = 0
+
+    def put(self, session_id, pdf_bytes):
+        """PDF'i oturum adına saklar ve anahtarını döner."""
+        key = uuid.uuid4().hex
+        with self._lock:
+            self._entries[key] = _Entry(session_id, pdf_bytes)
+            self._memory_bytes += len(pdf_bytes)
+            self._enforce_budgets(session_id)
+        return key
+
+    def get(self, key):
+        """PDF baytları; atılmışsa ya da anahtar bilinmiyorsa None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            if entry.data is not None:
+                return entry.data
+            path = entry.path
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def discard(self, key):
+        """Oturumun artık göstermediği PDF'i bırakır."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._release(entry)
+
+    def _release(self, entry):
+        if entry.data is not None:
+            self._memory_bytes -= entry.size
+        else:
+            self._spilled_bytes -= entry.size
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def _enforce_budgets(self, session_id):
+        # Önce oturum bütçesi: yalnızca bu oturumun bellekteki PDF'leri
+        session_bytes = sum(
+            e.size for e in self._entries.values() if e.session_id == session_id and e.data is not None
+        )
+        for key, entry in list(self._entries.items()):
+            if session_bytes <= self.session_max_bytes:
+                break
+            if entry.session_id == session_id and entry.data is not None:
+                session_bytes -= entry.size
+                self._spill(key, entry)
+
+        # Sonra toplam bütçe: tüm oturumlar, en uzun süredir kullanılmayandan başlayarak
+        for key, entry in list(self._entries.items()):
+            if self._memory_bytes <= self.max_bytes:
+                break
+            if entry.data is not None:
+                self._spill(key, entry)
+
+        # Disk bütçesi de aşılırsa en eski PDF'ler tamamen atılır
+        for key, entry in list(self._entries.items()):
+            if self._spilled_bytes <= self.spill_max_bytes:
+                break
+            if entry.data is None:
+                del self._entries[key]
+                self._release(entry)
+                self.evictions += 1
+
+    def _spill(self, key, entry):
+        if entry.size > self.spill_max_bytes:
+            del self._entries[key]
+            self._memory_bytes -= entry.size
+            self.evictions += 1
+            return
+        path = os.path.join(self._spill_path(), f"{key}.pdf")
+        with open(path, 'wb') as f:
+            f.write(entry.data)
+        entry.path = path
+        entry.data = None
+        self._memory_bytes -= entry.size
+        self._spilled_bytes += entry.size
+        self.spills += 1
+
+    def _spill_path(self):
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix='teklif-pdf-')
+            self._own_spill_dir = True
+            atexit.register(shutil.rmtree, self._spill_dir, True)
+        else:
+            os.makedirs(self._spill_dir, exist_ok=True)
+        return self._spill_dir
+
+    def session_usage(self, session_id):
+        """Oturumun bellekteki ve diske taşınmış PDF'leri (adet, bayt)."""
+        usage = {'entries': 0, 'memory_bytes': 0, 'spilled_bytes': 0}
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.session_id != session_id:
+                    continue
+                usage['entries'] += 1
+                usage['memory_bytes' if entry.data is not None else 'spilled_bytes'] += entry.size
+        return usage
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'sessions': len({e.session_id for e in self._entries.values()}),
+                'memory_bytes': self._memory_bytes,
+                'spilled_bytes': self._spilled_bytes,
+                'max_bytes': self.max_bytes,
+                'session_max_bytes': self.session_max_bytes,
+                'spill_max_bytes': self.spill_max_bytes,
+                'spills': self.spills,
+                'evictions': self.evictions,
+            }
+
+    def close(self):
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = self._spilled_bytes = 0
+            if self._own_spill_dir:
+                shutil.rmtree(self._spill_dir, ignore_errors=True)
+
+
+def store_from_env():
+    def megabytes(name, default):
+        return int(float(os.environ.get(name) or default) * _MB)
+
+    return PdfStore(
+        max_bytes=megabytes(PDF_MEMORY_MB_ENV, DEFAULT_PDF_MEMORY_MB),
+        session_max_bytes=megabytes(SESSION_PDF_MB_ENV, DEFAULT_SESSION_PDF_MB),
+        spill_max_bytes=megabytes(PDF_SPILL_MB_ENV, DEFAULT_PDF_SPILL_MB),
+        spill_dir=os.environ.get(PDF_SPILL_DIR_ENV) or None,
+    )
@@ -0,0 +1,93 @@
+"""Kolon bazlı (DataFrame) fiyat motoru.
+
+Türetilmiş fiyat kolonları satır satır değil, tüm tablo için tek seferde
+hesaplanır. Toplu zam veya KDV değişikliği önce yeni bir tablo üretir;
+``price_diff`` ile önizlenip onaylandıktan sonra ürün listesine ya da
+kataloğa yazılır.
+"""
+import numpy as np
+import pandas as pd
+
+from teklif.catalog import turkish_fold
+from teklif.products import BASE_COLUMNS, Product, validate_product
+
+
+def compute_prices(frame):
+    """Temel kolonlardan türetilmiş fiyat kolonlarını vektörel olarak hesaplar."""
+    frame = frame.copy()
+    frame['package_kg'] = frame['package_kg'].fillna(0.0).astype(float)
+    unit_price = frame['unit_price'].to_numpy(dtype=float)
+    vat_rate = frame['vat_rate'].to_numpy(dtype=float)
+    package_kg = frame['package_kg'].to_numpy()
+
+    # KG bazında KDV dahil fiyat
+    vat_price = unit_price * (1 + vat_rate / 100)
+
+    # Ambalajı olmayan ürünlerde ambalaj fiyatı 0
+    has_package = package_kg > 0
+    frame['vat_price'] = vat_price
+    frame['package_price_excl_vat'] = np.where(has_package, unit_price * package_kg, 0.0)
+    frame['package_price_incl_vat'] = np.where(has_package, vat_price * package_kg, 0.0)
+    return frame
+
+
+def products_to_frame(products):
+    frame = pd.DataFrame(list(products), columns=BASE_COLUMNS)
+    return compute_prices(frame.astype({'unit_price': float, 'vat_rate': float}))
+
+
+def frame_to_products(frame):
+    """DataFrame'i uygulamanın ürün kayıtlarına (Product) geri çevirir."""
+    return [
+        Product(name, float(unit_price), float(vat_rate), float(package_kg))
+        for name, unit_price, vat_rate, package_kg in zip(
+            frame['name'], frame['unit_price'], frame['vat_rate'], frame['package_kg'].fillna(0.0)
+        )
+    ]
+
+
+def name_mask(frame, name_contains):
+    """Adında ``name_contains`` geçen satırlar (Türkçe harf katlamasıyla)."""
+    needle = turkish_fold(name_contains or '')
+    if not needle:
+        return pd.Series(True, index=frame.index)
+    folded = frame['name'].map(turkish_fold)
+    return folded.str.contains(needle, regex=False)
+
+
+def reprice(frame, mask=None, percent=None, vat_rate=None):
+    """Seçili satırlara % zam/indirim ve/veya yeni KDV uygular; yeni tablo döner."""
+    frame = frame.copy()
+    if mask is None:
+        mask = pd.Series(True, index=frame.index)
+
+    if percent:
+        frame.loc[mask, 'unit_price'] = (frame.loc[mask, 'unit_price'] * (1 + percent / 100)).round(2)
+    if vat_rate is not None:
+        frame.loc[mask, 'vat_rate'] = float(vat_rate)
+
+    return compute_prices(frame)
+
+
+def invalid_rows(frame):
+    """Formun kurallarına (``validate_product``) uymayan satırlar: [(ürün adı, hata mesajı)]."""
+    errors = []
+    for name, unit_price, vat_rate, package_kg in zip(
+        frame['name'], frame['unit_price'], frame['vat_rate'], frame['package_kg']
+    ):
+        error = validate_product(name, unit_price, vat_rate, package_kg)
+        if error:
+            errors.append((name, error))
+    return errors
+
+
+def price_diff(before, after):
+    """Fiyatı değişen satırları eski/yeni değerleriyle yan yana listeler."""
+    columns = ['unit_price', 'vat_rate', 'vat_price', 'package_price_incl_vat']
+    changed = ~np.isclose(before[columns].to_numpy(), after[columns].to_numpy()).all(axis=1)
+
+    diff = pd.DataFrame({'name': before.loc[changed, 'name']})
+    for column in columns:
+        diff[f'{column}_old'] = before.loc[changed, column]
+        diff[f'{column}_new'] = after.loc[changed, column]
+    return diff
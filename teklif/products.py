@@ -0,0 +1,102 @@
+"""Ürün kaydı ve türetilmiş fiyat alanları."""
+import math
+from collections.abc import Mapping
+
+BASE_COLUMNS = ['name', 'unit_price', 'vat_rate', 'package_kg']
+DERIVED_COLUMNS = ['vat_price', 'package_price_excl_vat', 'package_price_incl_vat']
+PRODUCT_COLUMNS = BASE_COLUMNS + DERIVED_COLUMNS
+
+
+class Product(Mapping):
+    """Oturumlarda tutulan kompakt ürün kaydı.
+
+    Yalnızca dört temel alan saklanır (``__slots__``, sözlük yok); KDV dahil ve
+    ambalaj fiyatları her erişimde hesaplanır. Salt okunur bir sözlük gibi
+    davranır: ``product['vat_price']``, ``product.get(...)`` ve ``dict(product)``
+    eski ürün sözlükleriyle aynı sonucu verir.
+    """
+
+    __slots__ = ('name', 'unit_price', 'vat_rate', 'package_kg')
+
+    def __init__(self, name, unit_price, vat_rate, package_kg=0.0):
+        self.name = name
+        self.unit_price = unit_price
+        self.vat_rate = vat_rate
+        self.package_kg = package_kg
+
+    @property
+    def vat_price(self):
+        # KG bazında KDV dahil fiyat
+        return self.unit_price * (1 + self.vat_rate / 100)
+
+    @property
+    def package_price_excl_vat(self):
+        if self.package_kg and self.package_kg > 0:
+            return self.unit_price * self.package_kg
+        return 0.0
+
+    @property
+    def package_price_incl_vat(self):
+        if self.package_kg and self.package_kg > 0:
+            return self.vat_price * self.package_kg
+        return 0.0
+
+    def __getitem__(self, key):
+        if key not in _PRODUCT_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(PRODUCT_COLUMNS)
+
+    def __len__(self):
+        return len(PRODUCT_COLUMNS)
+
+    def __getstate__(self):
+        return (self.name, self.unit_price, self.vat_rate, self.package_kg)
+
+    def __setstate__(self, state):
+        self.name, self.unit_price, self.vat_rate, self.package_kg = state
+
+    def __repr__(self):
+        return (f"Product({self.name!r}, {self.unit_price!r}, {self.vat_rate!r}, "
+                f"{self.package_kg!r})")
+
+
+_PRODUCT_KEYS = frozenset(PRODUCT_COLUMNS)
+
+
+def make_product(name, unit_price, vat_rate, package_kg=0.0):
+    """Formdaki alanlardan ürün kaydı üretir; KDV dahil ve ambalaj fiyatları kayıttan okunur."""
+    return Product(name.strip(), unit_price, vat_rate, package_kg)
+
+
+def validate_product(name, unit_price, vat_rate, package_kg=0.0):
+    """Formun kurallarını uygular; geçersizse hata mesajı, geçerliyse None döner."""
+    if not name or not str(name).strip():
+        return "Ürün adı boş olamaz!"
+    # "nan", "inf" ve 1e400 gibi değerler sayı olarak okunur ama aşağıdaki karşılaştırmalardan geçer
+    if not all(math.isfinite(value) for value in (unit_price, vat_rate, package_kg)):
+        return "Fiyat, KDV ve ambalaj sonlu bir sayı olmalı!"
+    if unit_price < 0:
+        return "Kilogram fiyatı negatif olamaz!"
+    if not 0 <= vat_rate <= 100:
+        return "KDV oranı 0 ile 100 arasında olmalı!"
+    if package_kg < 0:
+        return "Ambalaj kg negatif olamaz!"
+    return None
+
+
+def parse_number(value, default=0.0):
+    """CSV/Excel hücresini sayıya çevirir; Türkçe ondalık virgülünü kabul eder."""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace(' ', '')
+    if not text:
+        return default
+    if ',' in text:
+        # 1.234,50 -> 1234.50
+        text = text.replace('.', '').replace(',', '.')
+    return float(text)
@@ -0,0 +1,369 @@
+"""Streamlit'ten bağımsız teklif PDF'i üretimi.
+
+Örnek::
+
+    from teklif.render import render_quote_pdf
+    pdf_bytes = render_quote_pdf("Saloon Burger", "Mehmet Yılmaz", products)
+
+``products`` uygulamadaki ürün sözlüklerinin listesidir (name, unit_price,
+vat_rate, vat_price, package_kg, package_price_incl_vat).
+"""
+import io
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import Flowable, SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+from teklif.diagnostics import span
+from teklif.fonts import setup_fonts
+from teklif.pdfcache import quote_cache_key
+from teklif.watermark import find_logo_file, get_watermark, logo_fingerprint
+
+# Stream'ler zaten Flate ile sıkıştırılıyor; üstüne eklenen ASCII85 katmanı
+# yalnızca 7-bit kanallar içindir ve her stream'i ~%25 büyütür. Teklifler ikili
+# dosya olarak indirilip gönderildiği için kapalı tutulur.
+rl_config.useA85 = 0
+
+BRAND_RED = colors.Color(0.86, 0.24, 0.26)
+
+WATERMARK_SIZE = 400
+WATERMARK_FORM = 'LogoWatermark'
+
+TABLE_HEADER = [
+    'Ürün Adı',
+    'KG Fiyatı\n(KDV Hariç)',
+    'KDV %',
+    'KG Fiyatı\n(KDV Dahil)',
+    'Ambalaj',
+    'Ambalaj Fiyatı\n(KDV Dahil)'
+]
+
+# Kolon genişlik oranları (toplamı 1 olacak)
+COL_WIDTH_FRACTIONS = [
+    0.28,  # Ürün Adı (biraz küçülttük)
+    0.16,  # KG Fiyatı (KDV Hariç)
+    0.08,  # KDV %
+    0.16,  # KG Fiyatı (KDV Dahil)
+    0.12,  # Ambalaj
+    0.20,  # Ambalaj Fiyatı (KDV Dahil) 🔥
+]
+
+# Bu satır sayısından büyük listeler büyük doküman modunda çizilir
+LARGE_TABLE_ROWS = 200
+
+# Büyük doküman modu hedefi: tek çekirdekte 10.000+ satıra kadar en az bu hız
+# (benchmarks ile ölçülür; süre ve bellek satır sayısıyla doğrusal artar)
+LARGE_TABLE_TARGET_ROWS_PER_SEC = 2000
+
+TABLE_FONT_SIZE = 9
+TABLE_PADDING = 8
+# Sabit satır yükseklikleri: hücre ölçümü yapılmaz (başlık iki satırlık)
+BODY_ROW_HEIGHT = TABLE_FONT_SIZE * 1.2 + 2 * TABLE_PADDING
+HEADER_ROW_HEIGHT = 2 * TABLE_FONT_SIZE * 1.2 + 2 * TABLE_PADDING
+
+ROW_COLORS = [colors.Color(1, 0.95, 0.95), colors.white]
+
+NOTES = """<b>NOTLAR:</b><br/>
+            • Fiyatlar Türk Lirası cinsindendir.<br/>
+            • Fiyatlar kilogram ve belirtilen ambalaj bazında verilmiştir.<br/>
+            • Minimum sipariş miktarları için ayrıca bilgi verilecektir.<br/>
+            • Teslim süresi sipariş onayından sonra belirlenecektir."""
+
+
+def quote_filename(issued_at=None):
+    issued_at = issued_at or datetime.now()
+    return f"fiyat_teklifi_{issued_at.strftime('%Y%m%d_%H%M')}.pdf"
+
+
+def quote_number(issued_at):
+    return f"BLD-{issued_at.strftime('%Y%m%d')}-{issued_at.strftime('%H%M')}"
+
+
+def product_row(product):
+    package_kg = product.get('package_kg', 0.0) or 0.0
+    if package_kg > 0:
+        ambalaj = f"{package_kg:.0f} kg"
+        pkg_incl = product.get(
+            'package_price_incl_vat',
+            product['vat_price'] * package_kg
+        )
+        pkg_incl_str = f"{pkg_incl:.2f} TL"
+    else:
+        ambalaj = "-"
+        pkg_incl_str = "-"
+
+    return [
+        product['name'],
+        f"{product['unit_price']:.2f} TL/kg",
+        f"%{product['vat_rate']:.0f}",
+        f"{product['vat_price']:.2f} TL/kg",
+        ambalaj,
+        pkg_incl_str
+    ]
+
+
+class ChunkedTable(Flowable):
+    """Binlerce satırlık ürün tablosu için sayfa sayfa bölünen tablo.
+
+    Satır yükseklikleri ve kolon genişlikleri önceden bilindiğinden, her
+    bölmede yalnızca o sayfaya sığan satırlar için başlıklı küçük bir Table
+    kurulur. Tek büyük Table'ın her sayfada kalan tüm satırları yeniden
+    ölçmesinden kaçınılır; çizim süresi satır sayısıyla doğrusal kalır.
+    """
+
+    def __init__(self, rows, col_widths, styles, first_row=0):
+        Flowable.__init__(self)
+        self.rows = rows
+        self.col_widths = col_widths
+        # styles: (çift, tek) başlangıç satırı için tablo stilleri
+        self.styles = styles
+        self.first_row = first_row
+        self.hAlign = 'LEFT'
+
+    def _table(self, rows, first_row):
+        table = Table(
+            [TABLE_HEADER] + rows,
+            colWidths=self.col_widths,
+            rowHeights=[HEADER_ROW_HEIGHT] + [BODY_ROW_HEIGHT] * len(rows),
+        )
+        # Satır renkleri sayfalar arasında kesintisiz devam etsin
+        table.setStyle(self.styles[first_row % 2])
+        return table
+
+    def wrap(self, availWidth, availHeight):
+        self.width = sum(self.col_widths)
+        self.height = HEADER_ROW_HEIGHT + BODY_ROW_HEIGHT * len(self.rows)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        fit = int((availHeight - HEADER_ROW_HEIGHT) // BODY_ROW_HEIGHT)
+        if fit <= 0:
+            return []
+        if fit >= len(self.rows):
+            return [self]
+        return [
+            self._table(self.rows[:fit], self.first_row),
+            ChunkedTable(self.rows[fit:], self.col_widths, self.styles, self.first_row + fit),
+        ]
+
+    def draw(self):
+        table = self._table(self.rows, self.first_row)
+        table.wrapOn(self.canv, self.width, self.height)
+        table.drawOn(self.canv, 0, 0)
+
+
+class QuoteRenderer:
+    """Font ve stilleri bir kez hazırlayıp her çağrıda PDF baytları üretir.
+
+    Aynı nesne birden çok teklif için (ve thread'ler arasında) kullanılabilir.
+    ``logo_file`` verilmezse logo çalışma klasöründe aranır; ``watermark=False``
+    filigranı tamamen kapatır. ``large_document`` None ise ``LARGE_TABLE_ROWS``
+    satırdan uzun listeler otomatik olarak büyük doküman modunda çizilir.
+    ``compact=True`` e-posta/WhatsApp için küçük, az renkli bir filigran kullanır.
+    """
+
+    def __init__(self, font_normal=None, font_bold=None, logo_file=None, watermark=True,
+                 large_document=None, compact=False):
+        if font_normal is None or font_bold is None:
+            with span('pdf.fonts'):
+                fonts = setup_fonts()
+            font_normal = font_normal or fonts.normal
+            font_bold = font_bold or fonts.bold
+
+        self.font_normal = font_normal
+        self.font_bold = font_bold
+        self.logo_file = logo_file
+        self.use_watermark = watermark
+        self.large_document = large_document
+        self.compact = compact
+        self._build_styles()
+
+    def _build_styles(self):
+        self.company_style = ParagraphStyle(
+            'CompanyStyle',
+            fontName=self.font_bold,
+            fontSize=16,
+            leading=20,  # <-- SATIR ARALIĞI (fontSize'tan büyük olsun)
+            spaceAfter=25,
+            alignment=TA_CENTER,
+            textColor=BRAND_RED
+        )
+
+        self.title_style = ParagraphStyle('TitleStyle', fontName=self.font_bold, fontSize=18,
+                                          spaceAfter=20, alignment=TA_CENTER,
+                                          textColor=BRAND_RED)
+
+        self.left_style = ParagraphStyle('LeftStyle', fontName=self.font_normal, fontSize=10,
+                                         spaceAfter=4, alignment=TA_LEFT, leftIndent=0)
+
+        self.heading_style = ParagraphStyle('HeadingStyle', fontName=self.font_bold, fontSize=12,
+                                            spaceAfter=8, textColor=BRAND_RED)
+
+        self.normal_style = ParagraphStyle(
+            'NormalStyle',
+            fontName=self.font_normal,
+            fontSize=10,
+            spaceAfter=6,
+            leftIndent=0,   # Notlar paragrafı tablonun hizasında başlasın
+            alignment=TA_LEFT
+        )
+
+        self.table_style = self._table_style(ROW_COLORS)
+        # Büyük doküman modu: tek satırdan başlayan parçalar için renkler ters
+        self.chunk_styles = (self.table_style, self._table_style(ROW_COLORS[::-1]))
+
+    def _table_style(self, row_colors):
+        return TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), BRAND_RED),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), self.font_bold),
+            ('FONTNAME', (0, 1), (-1, -1), self.font_normal),
+            ('FONTSIZE', (0, 0), (-1, 0), TABLE_FONT_SIZE),
+            ('FONTSIZE', (0, 1), (-1, -1), TABLE_FONT_SIZE),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), row_colors),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('LEFTPADDING', (0, 0), (-1, -1), TABLE_PADDING),
+            ('RIGHTPADDING', (0, 0), (-1, -1), TABLE_PADDING),
+            ('TOPPADDING', (0, 0), (-1, -1), TABLE_PADDING),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), TABLE_PADDING),
+        ])
+
+    def _is_large(self, products):
+        if self.large_document is None:
+            return len(products) > LARGE_TABLE_ROWS
+        return self.large_document
+
+    def _product_table(self, products, available_width):
+        # doc.width = sayfanın sol ve sağ marjı arasındaki kullanılabilir genişlik
+        col_widths = [f * available_width for f in COL_WIDTH_FRACTIONS]
+
+        if self._is_large(products):
+            rows = [product_row(product) for product in products]
+            # Sabit satır yüksekliği için hücreler tek satır olmalı
+            for row in rows:
+                row[0] = ' '.join(row[0].split())
+            return ChunkedTable(rows, col_widths, self.chunk_styles)
+
+        table_data = [TABLE_HEADER]
+        table_data.extend(product_row(product) for product in products)
+
+        # Sayfaya sığmayan tablolarda başlık satırı her sayfada tekrarlanır
+        product_table = Table(table_data, colWidths=col_widths, repeatRows=1)
+
+        # TABLOYU SAYFANIN SOL MARJINA HİZALA
+        product_table.hAlign = 'LEFT'
+        product_table.setStyle(self.table_style)
+        return product_table
+
+    def build_story(self, doc, customer_company, contact_person, products, issued_at, quote_no=None):
+        story = []
+
+        story.append(Paragraph("BULDUMLAR BİBER & BAHARAT<br/>ENTEGRE TESİSLERİ", self.company_style))
+        story.append(Paragraph("FİYAT TEKLİFİ", self.title_style))
+        story.append(Spacer(1, 15))
+
+        story.append(Paragraph(f"<b>Tarih:</b> {issued_at.strftime('%d/%m/%Y')}", self.left_style))
+        story.append(Paragraph(f"<b>Teklif No:</b> {quote_no or quote_number(issued_at)}", self.left_style))
+        story.append(Spacer(1, 20))
+
+        story.append(Paragraph("SAYIN", self.heading_style))
+        # Ad alanları düz metindir; "<" ve "&" Paragraph'ta etiket sanılmasın
+        customer_info = escape(customer_company)
+        if contact_person and contact_person.strip():
+            customer_info += f"<br/>Att: {escape(contact_person)}"
+        story.append(Paragraph(customer_info, self.normal_style))
+        story.append(Spacer(1, 20))
+
+        story.append(Paragraph("FİYAT LİSTESİ (KG ve Ambalaj Bazında)", self.heading_style))
+        story.append(Spacer(1, 10))
+
+        story.append(self._product_table(products, doc.width))
+        story.append(Spacer(1, 25))
+
+        story.append(Paragraph(NOTES, self.normal_style))
+        return story
+
+    def cache_key(self, customer_company, contact_person, products, issued_at=None):
+        """Bu renderer'ın aynı PDF'i üreteceği girdiler için önbellek anahtarı."""
+        issued_at = issued_at or datetime.now()
+        return quote_cache_key(
+            customer_company,
+            contact_person,
+            products,
+            logo_fingerprint(self.logo_file) if self.use_watermark else None,
+            (self.font_normal, self.font_bold),
+            issued_at.date(),
+            {'compact': self.compact},
+        )
+
+    def render(self, customer_company, contact_person, products, issued_at=None, quote_no=None):
+        """Teklifi üretir ve PDF baytlarını döner; ``quote_no`` verilmezse tarihten türetilir."""
+        with span('pdf.total', rows=len(products)):
+            return self._render(
+                customer_company, contact_person, products, issued_at or datetime.now(), quote_no
+            )
+
+    def _render(self, customer_company, contact_person, products, issued_at, quote_no):
+        # Filigran logosu bir kez hazırlanır, tüm sayfalarda ve tekliflerde kullanılır
+        watermark = None
+        if self.use_watermark:
+            with span('pdf.logo'):
+                logo_file = self.logo_file or find_logo_file()
+            with span('pdf.watermark'):
+                watermark = get_watermark(logo_file, compact=self.compact) if logo_file else None
+
+        # PDF oluştur (diske yazılmaz, tamamen bellekte)
+        pdf_buffer = io.BytesIO()
+        doc = SimpleDocTemplate(
+            pdf_buffer,
+            pagesize=A4,
+            topMargin=2*cm,
+            bottomMargin=2*cm,
+            leftMargin=2.5*cm,
+            rightMargin=2.5*cm,
+            pageCompression=1,
+        )
+        with span('pdf.story', rows=len(products)):
+            story = self.build_story(
+                doc, customer_company, contact_person, products, issued_at, quote_no
+            )
+
+        # Filigran ilk sayfada bir kez form XObject olarak çizilir; sonraki
+        # sayfalar yalnızca bu forma referans verir (görüntü tek kez gömülür,
+        # sayfa başına görüntü işleme maliyeti olmaz)
+        form_ready = []
+
+        def add_logo_watermark(canvas, doc):
+            if watermark is None:
+                return
+            try:
+                if not form_ready:
+                    page_width, page_height = A4
+                    x = (page_width - WATERMARK_SIZE) / 2
+                    y = (page_height - WATERMARK_SIZE) / 2
+                    canvas.beginForm(WATERMARK_FORM)
+                    canvas.drawImage(watermark, x, y, width=WATERMARK_SIZE, height=WATERMARK_SIZE,
+                                     mask='auto', preserveAspectRatio=True)
+                    canvas.endForm()
+                    form_ready.append(True)
+                canvas.doForm(WATERMARK_FORM)
+            except Exception:
+                pass
+
+        with span('pdf.build', rows=len(products)):
+            doc.build(story, onFirstPage=add_logo_watermark, onLaterPages=add_logo_watermark)
+        return pdf_buffer.getvalue()
+
+
+def render_quote_pdf(customer_company, contact_person, products, issued_at=None, **renderer_options):
+    """Tek seferlik kullanım için kısayol; toplu işlerde QuoteRenderer'ı tekrar kullanın."""
+    renderer = QuoteRenderer(**renderer_options)
+    return renderer.render(customer_company, contact_person, products, issued_at=issued_at)
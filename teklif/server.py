@@ -0,0 +1,219 @@
+"""ERP entegrasyonu için yerel HTTP teklif servisi.
+
+Kullanım::
+
+    python -m teklif.server --port 8600 -j 4
+    curl -X POST localhost:8600/quote -H 'Content-Type: application/json' \\
+         -d '{"customer_company": "Saloon Burger", "products": [{"name": "Pul Biber", "unit_price": 120}]}' \\
+         -o teklif.pdf
+
+``POST /quote`` uygulamadaki alanları JSON olarak alır (``customer_company``,
+``contact_person``, ``products`` listesi: ``name``, ``unit_price``,
+``vat_rate``, ``package_kg``; opsiyonel ``compact``) ve PDF döner. Hatalı
+girdide 400, kuyruk doluyken ``Retry-After`` ile 503 döner; ``--archive`` ile
+teklif numarası yalnızca kuyruğa alınan işe verilir, üretilemeyen PDF'lerin
+numarası arşivde başarısız işaretlenir. ``GET /health`` işçi havuzu durumunu
+JSON olarak verir.
+
+PDF'ler uygulamadaki sınırlı işçi havuzunda (``teklif.jobs``) üretilir; font
+kaydı ve filigran her işçide bir kez hazırlanıp istekler arasında paylaşılır.
+Bağlantılar HTTP/1.1 keep-alive ile açık tutulur.
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from teklif.importer import parse_row
+from teklif.jobs import DEFAULT_QUEUE, DEFAULT_WORKERS, QueueFullError, QuoteJobs
+from teklif.products import make_product
+from teklif.render import quote_filename
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8600
+
+MAX_BODY_BYTES = 5 * 1024 * 1024
+MAX_PRODUCTS = 10000
+# Tek bir PDF'in üretimi için beklenecek en uzun süre (sn)
+RENDER_TIMEOUT = 120
+RETRY_AFTER_SECONDS = 1
+
+
+def parse_quote_request(payload):
+    """JSON gövdesini (müşteri, yetkili, ürünler, render seçenekleri) olarak döner; hatada ValueError."""
+    if not isinstance(payload, dict):
+        raise ValueError("Gövde bir JSON nesnesi olmalı")
+    customer_company = str(payload.get('customer_company') or '').strip()
+    if not customer_company:
+        raise ValueError("customer_company boş olamaz")
+    contact_person = str(payload.get('contact_person') or '').strip()
+
+    rows = payload.get('products')
+    if not isinstance(rows, list) or not rows:
+        raise ValueError("products boş olmayan bir liste olmalı")
+    if len(rows) > MAX_PRODUCTS:
+        raise ValueError(f"En fazla {MAX_PRODUCTS} ürün gönderilebilir")
+
+    products = []
+    for index, raw in enumerate(rows, start=1):
+        if not isinstance(raw, dict):
+            raise ValueError(f"products[{index}]: nesne olmalı")
+        try:
+            fields = parse_row(raw)
+        except ValueError as e:
+            raise ValueError(f"products[{index}]: {e}")
+        products.append(make_product(**fields))
+
+    return customer_company, contact_person, products, {'compact': bool(payload.get('compact'))}
+
+
+class QuoteRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive: yanıtlar Content-Length ile gönderildiği için bağlantı açık kalabilir
+    protocol_version = 'HTTP/1.1'
+    server_version = 'TeklifServer/1.0'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, data, headers=None):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self._send(status, body, 'application/json; charset=utf-8', headers)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok', 'jobs': self.server.jobs.stats()})
+        else:
+            self._send_json(404, {'error': 'Bulunamadı'})
+
+    def do_POST(self):
+        if self.path != '/quote':
+            self._send_json(404, {'error': 'Bulunamadı'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Gövdenin nerede bittiği bilinmiyor; bağlantı yeniden kullanılamaz
+            self.close_connection = True
+            self._send_json(400, {'error': 'Geçersiz Content-Length'})
+            return
+        if length > MAX_BODY_BYTES:
+            # Gövde okunmadığı için bağlantı yeniden kullanılamaz
+            self.close_connection = True
+            self._send_json(413, {'error': 'İstek gövdesi çok büyük'})
+            return
+        try:
+            try:
+                payload = json.loads(self.rfile.read(length) or b'null')
+            except ValueError as e:
+                raise ValueError(f"Geçersiz JSON: {e}")
+            customer_company, contact_person, products, options = parse_quote_request(payload)
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        issued_at = datetime.now()
+        archive = self.server.archive
+        try:
+            # Kuyruk doluysa arşive yazılmaz; numara yalnızca kuyruğa alınan işe verilir
+            future, quote_no = self.server.jobs.issue_quote(
+                archive, customer_company, contact_person, products, issued_at, options
+            )
+        except QueueFullError as e:
+            self._send_json(503, {'error': str(e)}, {'Retry-After': str(RETRY_AFTER_SECONDS)})
+            return
+        except Exception as e:
+            self._send_json(500, {'error': f"PDF oluşturma hatası: {e}"})
+            return
+
+        try:
+            pdf_bytes = future.result(timeout=RENDER_TIMEOUT)
+        except Exception as e:
+            message = 'zaman aşımı' if isinstance(e, TimeoutError) else str(e)
+            if quote_no:
+                # Numara silinemez; arşiv aramasında gösterilmesin diye başarısız işaretlenir
+                archive.mark_failed(quote_no, message)
+            self._send_json(500, {'error': f"PDF oluşturma hatası: {message}"})
+            return
+        if archive is not None:
+            archive.attach_pdf(quote_no, pdf_bytes)
+
+        headers = {'Content-Disposition': f'attachment; filename="{quote_filename(issued_at)}"'}
+        if quote_no:
+            headers['X-Quote-Number'] = quote_no
+        self._send(200, pdf_bytes, 'application/pdf', headers)
+
+
+class QuoteServer(ThreadingHTTPServer):
+    # Bağlantı başına thread; asıl iş sınırlı işçi havuzunda yapılır
+    daemon_threads = True
+
+    def __init__(self, address, jobs, archive=None, verbose=False):
+        super().__init__(address, QuoteRequestHandler)
+        self.jobs = jobs
+        self.archive = archive
+        self.verbose = verbose
+
+
+def warm_up(jobs, workers):
+    """Font kaydı ve filigranı ilk istekten önce her işçide hazırlar."""
+    sample = [make_product("Isınma", 1.0, 1.0)]
+    futures = [jobs.submit_quote("Isınma", "", sample, datetime.now()) for _ in range(workers)]
+    for future in futures:
+        future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m teklif.server',
+        description='JSON ile teklif isteği alıp PDF döndüren yerel HTTP servisi.',
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('-j', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help='Aynı anda üretilecek en fazla PDF sayısı')
+    parser.add_argument('--queue', type=int, default=DEFAULT_QUEUE,
+                        help='Bekleyen + çalışan en fazla iş (aşılırsa 503)')
+    parser.add_argument('--executor', choices=['thread', 'process'], default='process',
+                        help='İşçi türü (varsayılan: process, CPU çekirdeklerini kullanır)')
+    parser.add_argument('--archive', action='store_true',
+                        help='Teklifleri arşive kaydet ve X-Quote-Number başlığında numarayı döndür')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Her isteği logla')
+    args = parser.parse_args(argv)
+
+    jobs = QuoteJobs(max_workers=args.workers, max_pending=args.queue, kind=args.executor)
+    archive = None
+    if args.archive:
+        from teklif.archive import QuoteArchive
+        archive = QuoteArchive()
+
+    warm_up(jobs, args.workers)
+    server = QuoteServer((args.host, args.port), jobs, archive, args.verbose)
+    print(f"Teklif servisi http://{args.host}:{args.port} ({args.workers} {args.executor} işçi)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        jobs.shutdown()
+        if archive is not None:
+            archive.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
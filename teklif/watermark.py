@@ -0,0 +1,100 @@
+"""Logo filigranı: soluk logo bir kez hazırlanır, bellekte tekrar kullanılır."""
+import os
+from functools import lru_cache
+
+from PIL import Image as PILImage
+from reportlab.lib.utils import ImageReader
+
+LOGO_NAMES = ['logo.png', 'logo.jpg', 'logo.jpeg', 'Logo.png', 'LOGO.png']
+
+MAX_LOGO_SIZE = 350
+CANVAS_SIZE = 400
+WATERMARK_OPACITY = 0.25
+
+# Kompakt çıktı: filigran beyaza oturtulup küçültülür ve paletle sınırlanır
+COMPACT_CANVAS_SIZE = 200
+COMPACT_COLORS = 32
+
+# Alfa kanalı için tek seferlik tablo (256 giriş) - piksel döngüsü yerine
+_ALPHA_LUT = [int(a * WATERMARK_OPACITY) for a in range(256)]
+
+
+def find_logo_file(search_dir=None):
+    for name in LOGO_NAMES:
+        path = os.path.join(search_dir, name) if search_dir else name
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def logo_fingerprint(logo_file=None):
+    """Logonun (yol, mtime, boyut) üçlüsü; logo yoksa None. Önbellek anahtarlarında kullanılır."""
+    if logo_file is None:
+        logo_file = find_logo_file()
+    if not logo_file:
+        return None
+    try:
+        stat = os.stat(logo_file)
+    except OSError:
+        return None
+    return [os.path.abspath(logo_file), stat.st_mtime_ns, stat.st_size]
+
+
+def build_watermark_image(logo_file):
+    """Logoyu küçültüp 400x400 şeffaf tuvale ortalar ve alfasını %25'e çeker."""
+    with PILImage.open(logo_file) as original_img:
+        if original_img.mode != 'RGBA':
+            img = original_img.convert('RGBA')
+        else:
+            img = original_img.copy()
+
+    img.thumbnail((MAX_LOGO_SIZE, MAX_LOGO_SIZE), PILImage.Resampling.LANCZOS)
+
+    canvas = PILImage.new('RGBA', (CANVAS_SIZE, CANVAS_SIZE), (0, 0, 0, 0))
+    x = (CANVAS_SIZE - img.size[0]) // 2
+    y = (CANVAS_SIZE - img.size[1]) // 2
+    canvas.paste(img, (x, y), img)
+
+    # Alfa ölçekleme tek bir point() çağrısıyla C tarafında yapılır
+    canvas.putalpha(canvas.getchannel('A').point(_ALPHA_LUT))
+    return canvas
+
+
+def build_compact_watermark_image(logo_file):
+    """Filigranın küçük, saydamlık maskesiz ve az renkli (RGB) hali.
+
+    Filigran sayfada her şeyden önce, beyaz zemine çizildiği için beyaza
+    oturtmak görünümü değiştirmez; PDF'te ayrı bir alfa maskesi gerekmez.
+    """
+    watermark = build_watermark_image(logo_file)
+    flat = PILImage.new('RGB', watermark.size, 'white')
+    flat.paste(watermark, mask=watermark.getchannel('A'))
+    flat = flat.resize((COMPACT_CANVAS_SIZE, COMPACT_CANVAS_SIZE), PILImage.Resampling.LANCZOS)
+    # reportlab paletli görüntüyü her dokümanda RGB'ye çevirir; burada bir kez çevrilir
+    return flat.quantize(COMPACT_COLORS).convert('RGB')
+
+
+@lru_cache(maxsize=8)
+def _cached_watermark(logo_file, mtime_ns, size, compact=False):
+    # Anahtar (yol, mtime, boyut): logo dosyası değişirse yeniden üretilir
+    if compact:
+        return ImageReader(build_compact_watermark_image(logo_file))
+    return ImageReader(build_watermark_image(logo_file))
+
+
+def get_watermark(logo_file=None, compact=False):
+    """Filigranı ImageReader olarak döner; logo yoksa veya okunamazsa None."""
+    if logo_file is None:
+        logo_file = find_logo_file()
+    if not logo_file:
+        return None
+
+    try:
+        stat = os.stat(logo_file)
+        return _cached_watermark(os.path.abspath(logo_file), stat.st_mtime_ns, stat.st_size, compact)
+    except Exception:
+        return None
+
+
+def clear_watermark_cache():
+    _cached_watermark.cache_clear()